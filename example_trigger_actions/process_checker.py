@@ -25,16 +25,18 @@ class ProcessCheckerTool(Tool):
         Returns:
             Dict containing process status information
         """
-        for proc in psutil.process_iter(['name']):
-            try:
-                if process_name.lower() in proc.info['name'].lower():
-                    return {
-                        "running": True,
-                        "process_name": proc.info['name'],
-                        "pid": proc.pid
-                    }
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+        needle = process_name.lower()
+        # process_iter pre-fetches the requested attrs and swallows processes
+        # that vanish or deny access, setting the value to None instead
+        for proc in psutil.process_iter(['name', 'pid']):
+            info = proc.info
+            name = info['name']
+            if name and needle in name.lower():
+                return {
+                    "running": True,
+                    "process_name": name,
+                    "pid": info['pid']
+                }
         return {
             "running": False,
             "process_name": process_name
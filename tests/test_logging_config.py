@@ -0,0 +1,27 @@
+import logging
+
+import pytest
+
+from triggered import logging_config
+
+
+@pytest.fixture
+def root_handlers():
+    """Restore the root logger's handlers after a test."""
+    root = logging.getLogger()
+    saved = root.handlers[:]
+    yield root
+    root.handlers = saved
+
+
+def test_setup_logging_reattaches_removed_handlers(root_handlers):
+    logging_config.setup_logging()
+    ours = (logging_config._file_handler, logging_config._console_handler)
+    installed = [h for h in root_handlers.handlers if h in ours]
+    assert len(installed) == 2
+
+    # What Celery's worker_hijack_root_logger does
+    root_handlers.handlers = []
+    logging_config.setup_logging()
+    logging_config.setup_logging()
+    assert root_handlers.handlers == installed
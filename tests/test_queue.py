@@ -0,0 +1,44 @@
+import logging
+import os
+import tempfile
+
+# The queue module creates its data directory at import time
+os.environ.setdefault("TRIGGERED_DATA_DIR", os.path.join(tempfile.mkdtemp(), "data"))
+
+from kombu.serialization import dumps, loads  # noqa: E402
+
+import triggered.queue  # noqa: E402  registers the orjson serializer
+from triggered import logging_config  # noqa: E402
+
+
+def test_orjson_serializer_round_trips_non_str_keys():
+    payload = {"counts": {1: "one", 2: "two"}, "flag": True}
+    content_type, encoding, data = dumps(payload, serializer="orjson")
+    assert content_type == "application/x-orjson"
+    # JSON object keys come back as strings
+    assert loads(data, content_type, encoding) == {"counts": {"1": "one", "2": "two"}, "flag": True}
+
+
+def test_setup_worker_logging_tolerates_streams_without_reconfigure(monkeypatch):
+    class Proxy:
+        def write(self, data):
+            return len(data)
+
+        def flush(self):
+            pass
+
+    monkeypatch.setattr(triggered.queue, "setup_logging", lambda: None)
+    monkeypatch.setattr(triggered.queue.sys, "stdout", Proxy())
+    monkeypatch.setattr(triggered.queue.sys, "stderr", Proxy())
+    triggered.queue.setup_worker_logging()
+
+
+def test_solo_worker_keeps_file_handler():
+    """Celery clears the root logger while starting; the file handler is put back."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        triggered.queue.app.Worker(pool="solo", loglevel="INFO", redirect_stdouts=False)
+        assert logging_config._file_handler in root.handlers
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
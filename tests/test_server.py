@@ -0,0 +1,242 @@
+import os
+import tempfile
+
+# The server reads its directories and worker mode at import time
+_TMP = tempfile.mkdtemp()
+os.environ["TRIGGERED_START_WORKER"] = "false"
+os.environ["TRIGGERED_TRIGGER_ACTIONS_PATH"] = os.path.join(_TMP, "trigger_actions")
+os.environ["TRIGGERED_DATA_DIR"] = os.path.join(_TMP, "data")
+
+import asyncio  # noqa: E402
+import types  # noqa: E402
+from collections import deque  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from triggered import server  # noqa: E402
+from triggered.core import TriggerAction, TriggerContext  # noqa: E402
+from triggered.triggers.webhook_monitor import WebHookMonitorTrigger  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    transport = httpx.ASGITransport(app=server.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.fixture
+def runtime_state():
+    """Restore the shared runtime's startup state after a test."""
+    ready, error = server.runtime._ready, server.runtime._start_error
+    server.runtime._ready = asyncio.Event()
+    server.runtime._start_error = None
+    yield server.runtime
+    server.runtime._ready, server.runtime._start_error = ready, error
+
+
+@pytest.fixture
+def mount_webhook(runtime_state):
+    """Mount webhook triggers on a ready runtime and unmount them afterwards."""
+    runtime_state._ready.set()
+    mounted = []
+
+    def mount(config):
+        trigger = WebHookMonitorTrigger(config)
+        runtime_state._mount_webhook(trigger)
+        mounted.append(trigger.route)
+        return trigger
+
+    yield mount
+    for route in mounted:
+        server._webhook_triggers.pop(route, None)
+
+
+@pytest.mark.asyncio
+async def test_failed_startup_returns_503_immediately(client, runtime_state, monkeypatch):
+    """A crashed runtime start releases gated requests with 503 instead of holding them."""
+    monkeypatch.setattr(server, "STARTUP_TIMEOUT", 30)
+
+    async def failing_start():
+        raise RuntimeError("boom")
+
+    task = asyncio.create_task(failing_start())
+    task.add_done_callback(server._log_start_result)
+    await asyncio.gather(task, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    response = await asyncio.wait_for(client.get("/trigger_actions"), timeout=5)
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Runtime failed to start"}
+    # Health checks stay reachable
+    assert (await client.get("/status")).status_code == 200
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "headers, status",
+    [({}, 403), ({"X-Auth-Key": "wrong"}, 403), ({"X-Auth-Key": "secret"}, 200)],
+)
+async def test_webhook_auth_key(client, mount_webhook, headers, status):
+    trigger = mount_webhook({"name": f"auth-{status}-{len(headers)}", "auth_key": "secret"})
+    response = await client.post(trigger.route, json={"a": 1}, headers=headers)
+    assert response.status_code == status
+    if status == 403:
+        assert response.json() == {"error": "Invalid auth key"}
+        assert trigger._queue.empty()
+    else:
+        assert trigger._queue.get_nowait()["body"] == {"a": 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("auth_key", [None, ""])
+async def test_webhook_without_auth_key_accepts_requests(client, mount_webhook, auth_key):
+    trigger = mount_webhook({"name": f"open-{auth_key}", "auth_key": auth_key})
+    response = await client.post(trigger.route, json={}, headers={"X-Auth-Key": "anything"})
+    assert response.status_code == 200
+    assert not trigger._queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_webhook_queue_full_returns_503(client, mount_webhook):
+    trigger = mount_webhook({"name": "full", "max_queue": 1})
+    assert (await client.post(trigger.route, json={"n": 1})).status_code == 200
+    response = await client.post(trigger.route, json={"n": 2})
+    assert response.status_code == 503
+    assert response.json() == {"error": "Webhook queue full"}
+    assert response.headers["retry-after"] == "1"
+    # The accepted event is kept and the rejected one is dropped
+    assert trigger._queue.qsize() == 1
+    assert trigger._queue.get_nowait()["body"] == {"n": 1}
+
+
+@pytest.fixture
+def dispatch(monkeypatch):
+    """Run a fresh runtime's dispatcher with the Celery send recorded.
+
+    Returns ``(runtime, sent)``; each entry of ``sent`` is one published batch
+    as a list of ``(trigger-action id, context data)`` pairs.
+    """
+    sent = []
+
+    def send_batch(batch):
+        sent.append([(ta.id, ctx.data) for ta, ctx in batch])
+        return [types.SimpleNamespace(id=f"task-{n}") for n in range(len(batch))]
+
+    monkeypatch.setattr(server, "START_WORKER", True)
+    monkeypatch.setattr(server, "RECENT_EVENTS", deque())
+    monkeypatch.setattr(server, "_send_batch_to_celery", send_batch)
+    return server.RuntimeManager(), sent
+
+
+def _event(ta_id, **data):
+    return types.SimpleNamespace(id=ta_id, filename=None), TriggerContext(trigger_name="t", data=data)
+
+
+async def _run_dispatcher(runtime, seconds):
+    task = asyncio.create_task(runtime._dispatcher())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_splits_batches_in_order(dispatch, monkeypatch):
+    runtime, sent = dispatch
+    monkeypatch.setattr(server, "DISPATCH_BATCH_SIZE", 3)
+    monkeypatch.setattr(server, "DISPATCH_WINDOW", 0.05)
+    for n in range(7):
+        runtime._queue.put_nowait(_event("a", n=n))
+    await _run_dispatcher(runtime, 0.2)
+    assert [[data["n"] for _, data in batch] for batch in sent] == [[0, 1, 2], [3, 4, 5], [6]]
+    assert len(server.RECENT_EVENTS) == 7
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_coalesces_events_within_window(dispatch, monkeypatch):
+    runtime, sent = dispatch
+    monkeypatch.setattr(server, "DISPATCH_BATCH_SIZE", 64)
+    monkeypatch.setattr(server, "DISPATCH_WINDOW", 0.1)
+
+    async def feed():
+        await runtime._queue.put(_event("a", n=0))
+        await asyncio.sleep(0.03)
+        await runtime._queue.put(_event("a", n=1))
+        # Well past the window opened by the first event
+        await asyncio.sleep(0.3)
+        await runtime._queue.put(_event("a", n=2))
+
+    feeder = asyncio.create_task(feed())
+    await _run_dispatcher(runtime, 0.6)
+    await feeder
+    assert [[data["n"] for _, data in batch] for batch in sent] == [[0, 1], [2]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dedup", [True, False])
+async def test_dispatcher_dedup(dispatch, monkeypatch, dedup):
+    runtime, sent = dispatch
+    monkeypatch.setattr(server, "DISPATCH_BATCH_SIZE", 64)
+    monkeypatch.setattr(server, "DISPATCH_WINDOW", 0.05)
+    monkeypatch.setattr(server, "DISPATCH_DEDUP", dedup)
+    events = [
+        _event("a", n=1, m=2),
+        _event("b", n=1, m=2),
+        _event("a", m=2, n=1),  # same data as the first, different key order
+        _event("a", n=3),
+    ]
+    for event in events:
+        runtime._queue.put_nowait(event)
+    await _run_dispatcher(runtime, 0.2)
+    if dedup:
+        # The first occurrence of each (trigger-action, data) pair is kept in order
+        assert sent == [[("a", {"n": 1, "m": 2}), ("b", {"n": 1, "m": 2}), ("a", {"n": 3})]]
+    else:
+        assert len(sent) == 1 and len(sent[0]) == 4
+
+
+def test_dedup_batch_keeps_unencodable_data():
+    events = [_event("a", n=1), _event("a", n=1)]
+    for _, ctx in events:
+        ctx.data["obj"] = object()
+    assert server._dedup_batch(events) == events
+
+
+def _webhook_action(ta_id, **config):
+    return TriggerAction(
+        id=ta_id,
+        trigger={"type": "webhook", "config": {"name": ta_id, "route": f"/hooks/{ta_id}", **config}},
+        action={"type": "shell", "config": {"name": "noop", "command": "true"}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_replaced_and_removed_webhooks_leave_no_orphaned_route(client, runtime_state):
+    runtime_state._ready.set()
+    ta = _webhook_action("lifecycle")
+    route = "/hooks/lifecycle"
+    runtime_state.trigger_actions[ta.id] = ta
+    runtime_state._start_watcher(ta)
+    old_trigger, old_task = runtime_state._watchers[ta.id]
+    try:
+        assert (await client.post(route, json={})).status_code == 200
+
+        runtime_state.replace_trigger_action(_webhook_action("lifecycle", auth_key="new"))
+        await asyncio.sleep(0)
+        assert old_task.cancelled()
+        new_trigger = server._webhook_triggers[route]
+        assert new_trigger is not old_trigger
+        # The route is served by the replacement, which requires its own key
+        assert (await client.post(route, json={})).status_code == 403
+        assert (await client.post(route, json={}, headers={"X-Auth-Key": "new"})).status_code == 200
+
+        runtime_state.remove_trigger_action(ta)
+        assert route not in server._webhook_triggers
+        assert ta.id not in runtime_state._watchers
+        response = await client.post(route, json={})
+        assert response.status_code == 404
+        assert response.json() == {"error": "Webhook not found"}
+    finally:
+        runtime_state.remove_trigger_action(ta)
+        while not runtime_state._queue.empty():
+            runtime_state._queue.get_nowait()
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import os
 from unittest.mock import patch, MagicMock
@@ -8,6 +9,7 @@ from triggered.tools import (
 )
 from triggered.models import (
     DummyModel,
+    LiteLLMModel,
     get_model
 )
 
@@ -46,6 +48,17 @@ def test_get_model():
     assert model1 is model2
 
 
+# Test JSON extraction from model output
+def test_extract_json_from_text():
+    """Test that JSON objects are found in plain, fenced and prose responses."""
+    model = LiteLLMModel(model="dummy")
+    assert model._extract_json_from_text('{"trigger": true}') == '{"trigger": true}'
+    assert model._extract_json_from_text('```json\n{"a": {"b": 1}}\n```') == '{"a": {"b": 1}}'
+    nested = 'Decision: {"trigger": false, "meta": {"reason": "braces } in text"}} done'
+    assert model._extract_json_from_text(nested) == '{"trigger": false, "meta": {"reason": "braces } in text"}}'
+    assert model._extract_json_from_text("no json here") is None
+
+
 # Test Tool Configuration
 def test_tool_configuration():
     """Test tool configuration handling."""
@@ -73,4 +86,128 @@ async def test_error_handling():
             mock_pull.side_effect = Exception("pull failed")
             model = DummyModel()
             result = await model.ainvoke("test")
-            assert "Error: Failed to load model" in result or "yes" in result 
\ No newline at end of file
+            assert "Error: Failed to load model" in result or "yes" in result 
+
+def _single_flight_model():
+    """LiteLLMModel whose request body counts calls and waits to be released."""
+    with patch("triggered.models._load_litellm", return_value=MagicMock()):
+        model = LiteLLMModel(model="test/model")
+    model.calls = 0
+    model.release = asyncio.Event()
+
+    async def fake_ainvoke(prompt, tools, expect_json):
+        model.calls += 1
+        await model.release.wait()
+        return f"answer to {prompt}"
+
+    model._ainvoke = fake_ainvoke
+    return model
+
+
+# Test single-flight of identical concurrent calls
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_completion():
+    model = _single_flight_model()
+    first = asyncio.create_task(model.ainvoke("q", tools=[{"b": 1, "a": 2}]))
+    second = asyncio.create_task(model.ainvoke("q", tools=[{"a": 2, "b": 1}]))
+    other = asyncio.create_task(model.ainvoke("q", expect_json=True))
+    await asyncio.sleep(0)
+    model.release.set()
+    assert await asyncio.gather(first, second, other) == ["answer to q"] * 3
+    # Tool key order does not matter; expect_json makes a separate request
+    assert model.calls == 2
+    assert model._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_leaves_shared_result_intact():
+    model = _single_flight_model()
+    cancelled = asyncio.create_task(model.ainvoke("q"))
+    survivor = asyncio.create_task(model.ainvoke("q"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    model.release.set()
+    assert await survivor == "answer to q"
+    assert cancelled.cancelled()
+    assert model.calls == 1
+
+
+def test_cached_tool_list_is_not_shared():
+    with patch("triggered.models._load_litellm", return_value=MagicMock()):
+        model = LiteLLMModel(model="test/model")
+    first = model._convert_tools_to_litellm_format(["random_number"])
+    first.append({"type": "function"})
+    first[0]["function"]["name"] = "changed"
+    first[0]["function"]["parameters"]["properties"].clear()
+    second = model._convert_tools_to_litellm_format(["random_number"])
+    assert len(second) == 1
+    assert second[0]["function"]["name"] == RandomNumberTool.name
+    assert second[0]["function"]["parameters"]["properties"]
+    # Lists served from the cache are copies too
+    second[0]["function"]["name"] = "changed"
+    third = model._convert_tools_to_litellm_format(["random_number"])
+    assert third[0]["function"]["name"] == RandomNumberTool.name
+
+
+def test_function_schema_is_copied():
+    schema = RandomNumberTool.get_function_schema()
+    schema["function"]["name"] = "changed"
+    assert RandomNumberTool.get_function_schema()["function"]["name"] == RandomNumberTool.name
+
+
+def test_concurrency_limit_works_across_event_loops(monkeypatch):
+    """A cached adapter is used from several loops; each gets its own semaphore."""
+    monkeypatch.setattr("triggered.models._MAX_CONCURRENT", 1)
+    active = []
+
+    async def acompletion(**kwargs):
+        active.append(1)
+        assert len(active) == 1
+        await asyncio.sleep(0.01)
+        active.pop()
+        return "done"
+
+    with patch("triggered.models._load_litellm", return_value=acompletion):
+        model = LiteLLMModel(model="test/model")
+
+    async def burst():
+        return await asyncio.gather(*(model._complete([]) for _ in range(3)))
+
+    # Contention on the second loop fails if the semaphore is bound to the first
+    assert asyncio.run(burst()) == ["done"] * 3
+    assert asyncio.run(burst()) == ["done"] * 3
+
+
+@pytest.mark.asyncio
+async def test_astream_releases_slot_while_caller_holds_a_chunk(monkeypatch):
+    monkeypatch.setattr("triggered.models._MAX_CONCURRENT", 1)
+
+    def chunk(text):
+        return MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+
+    async def stream():
+        for text in ("a", "b"):
+            yield chunk(text)
+
+    async def acompletion(**kwargs):
+        return stream()
+
+    with patch("triggered.models._load_litellm", return_value=acompletion):
+        model = LiteLLMModel(model="test/model")
+
+    async def complete(messages, tools=None):
+        return MagicMock(choices=[MagicMock(message=MagicMock(tool_calls=[MagicMock()]))])
+
+    async def run_tool_calls(message, messages):
+        return None
+
+    model._complete = complete
+    model._run_tool_calls = run_tool_calls
+
+    received = []
+    async for text in model.astream("q"):
+        # Another caller could take the only model slot right now
+        assert not model._semaphore().locked()
+        received.append(text)
+    assert received == ["a", "b"]
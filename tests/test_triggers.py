@@ -0,0 +1,242 @@
+import asyncio
+import datetime as _dt
+import os
+import time
+import types
+import zoneinfo
+from pathlib import Path
+
+import pytest
+
+from triggered.core import TriggerContext
+from triggered.triggers import ai, cron, folder_monitor
+from triggered.triggers.ai import AITrigger
+from triggered.triggers.cron import CronTrigger
+from triggered.triggers.folder_monitor import FolderMonitorTrigger
+from triggered.triggers.webhook_monitor import WebHookMonitorTrigger
+
+
+WARSAW = zoneinfo.ZoneInfo("Europe/Warsaw")
+
+
+@pytest.mark.asyncio
+async def test_cron_watch_delays_across_dst(monkeypatch):
+    """Sleeps follow real time, so daily fires across the spring-forward are 23 hours apart."""
+    now = _dt.datetime(2026, 3, 27, 10, 0, tzinfo=WARSAW)
+
+    class FrozenDatetime(_dt.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.astimezone(tz)
+
+    monkeypatch.setattr(cron, "_dt", types.SimpleNamespace(datetime=FrozenDatetime))
+    monkeypatch.setattr(cron, "time", types.SimpleNamespace(time=now.timestamp))
+    trigger = CronTrigger({"name": "dst", "expression": "0 9 * * *", "timezone": "Europe/Warsaw"})
+
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    fired = []
+
+    async def queue_put(ctx):
+        fired.append(ctx)
+        if len(fired) == 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(cron.asyncio, "sleep", fake_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await trigger.watch(queue_put)
+    # Friday 10:00 CET -> Saturday 09:00 CET -> Sunday 09:00 CEST; the sleeps
+    # do not advance the loop clock, so both delays count from Friday
+    assert delays == [pytest.approx(23 * 3600, abs=1), pytest.approx(46 * 3600, abs=1)]
+
+
+class _TimedAITrigger(AITrigger):
+    """AI trigger whose check only records when it ran and takes ``duration``."""
+
+    def __init__(self, interval, duration):
+        super().__init__({"name": "timed", "prompt": "p", "model": "dummy", "interval": interval})
+        self.duration = duration
+        self.starts = []
+
+    async def check(self):
+        self.starts.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(self.duration)
+        return TriggerContext(trigger_name=self.name, data={"trigger": False})
+
+
+async def _run_for(coro, seconds):
+    task = asyncio.create_task(coro)
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_ai_watch_keeps_cadence():
+    trigger = _TimedAITrigger(interval=0.1, duration=0.03)
+    await _run_for(trigger.watch(None), 0.45)
+    gaps = [b - a for a, b in zip(trigger.starts, trigger.starts[1:])]
+    assert gaps and all(gap == pytest.approx(0.1, abs=0.03) for gap in gaps)
+
+
+@pytest.mark.asyncio
+async def test_ai_watch_idles_a_full_interval_after_overrun():
+    """A check slower than the interval is followed by a full interval of idle time."""
+    trigger = _TimedAITrigger(interval=0.1, duration=0.15)
+    await _run_for(trigger.watch(None), 0.7)
+    gaps = [b - a for a, b in zip(trigger.starts, trigger.starts[1:])]
+    assert gaps and all(gap >= 0.24 for gap in gaps)
+
+
+@pytest.mark.asyncio
+async def test_folder_polling_idles_a_full_interval_after_overrun(tmp_path, monkeypatch):
+    """A scan slower than the interval does not turn into a busy rescan loop."""
+    monkeypatch.setattr(folder_monitor, "awatch", None)
+    trigger = FolderMonitorTrigger({"name": "slow", "path": str(tmp_path)})
+    trigger.interval = 0.1
+    starts = []
+
+    def slow_scan():
+        starts.append(time.monotonic())
+        time.sleep(0.15)
+        return {}
+
+    monkeypatch.setattr(trigger, "_hash_dir", slow_scan)
+    await _run_for(trigger.watch(None), 0.9)
+    # The first entry is the baseline snapshot taken before polling starts
+    gaps = [b - a for a, b in zip(starts[1:], starts[2:])]
+    assert gaps and all(gap >= 0.24 for gap in gaps)
+
+
+def _webhook_bodies(contexts):
+    return [ctx.data["payload"] for ctx in contexts]
+
+
+@pytest.mark.asyncio
+async def test_webhook_batch_flushes_on_size_limit():
+    trigger = WebHookMonitorTrigger({"name": "batched", "batch_max_size": 2, "batch_timeout_ms": 5000})
+    for n in range(5):
+        await trigger.enqueue({"body": {"n": n}})
+    contexts = []
+
+    async def collect(ctx):
+        contexts.append(ctx)
+
+    await _run_for(trigger.watch(collect), 0.2)
+    # Full batches go out without waiting for the timeout; the remainder is still held
+    assert _webhook_bodies(contexts) == [[{"n": 0}, {"n": 1}], [{"n": 2}, {"n": 3}]]
+
+
+@pytest.mark.asyncio
+async def test_webhook_batch_flushes_on_timeout():
+    trigger = WebHookMonitorTrigger({"name": "batched", "batch_max_size": 10, "batch_timeout_ms": 50})
+    contexts = []
+
+    async def collect(ctx):
+        contexts.append(ctx)
+
+    async def feed():
+        await trigger.enqueue({"body": {"n": 0}})
+        await trigger.enqueue({"body": {"n": 1}})
+        await asyncio.sleep(0.2)
+        await trigger.enqueue({"body": {"n": 2}})
+
+    feeder = asyncio.create_task(feed())
+    await _run_for(trigger.watch(collect), 0.4)
+    await feeder
+    assert _webhook_bodies(contexts) == [[{"n": 0}, {"n": 1}], [{"n": 2}]]
+    assert all(len(ctx.data["headers"]) == len(ctx.data["payload"]) for ctx in contexts)
+
+
+@pytest.mark.asyncio
+async def test_folder_polling_unchanged_folder_emits_nothing(tmp_path, monkeypatch):
+    monkeypatch.setattr(folder_monitor, "awatch", None)
+    (tmp_path / "a.txt").write_text("a")
+    trigger = FolderMonitorTrigger({"name": "idle", "path": str(tmp_path)})
+    trigger.interval = 0.05
+    contexts = []
+
+    async def collect(ctx):
+        contexts.append(ctx)
+
+    await _run_for(trigger.watch(collect), 0.3)
+    assert contexts == []
+
+
+@pytest.mark.asyncio
+async def test_ai_decision_cache_ttl(monkeypatch):
+    monkeypatch.setattr(ai, "_DECISION_CACHE", {("stale",): (-1.0, {"trigger": False})})
+    clock = [1000.0]
+    # Replace the module reference only; the event loop keeps the real clock
+    monkeypatch.setattr(ai, "time", types.SimpleNamespace(monotonic=lambda: clock[0]))
+    trigger = AITrigger({"name": "cached", "prompt": "p", "model": "dummy", "cache_ttl": 10})
+    calls = []
+
+    async def ainvoke(prompt, **kwargs):
+        calls.append(prompt)
+        return '{"trigger": true, "reason": "r"}'
+
+    monkeypatch.setattr(trigger.model, "ainvoke", ainvoke)
+
+    assert (await trigger.check()).data == {"trigger": True, "reason": "r"}
+    # Writing the decision pruned the expired entry
+    assert list(ai._DECISION_CACHE) == [trigger._cache_key]
+    clock[0] += 5
+    assert (await trigger.check()).data["trigger"] is True
+    assert len(calls) == 1
+    clock[0] += 10
+    await trigger.check()
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_folder_events_report_new_matching_files(tmp_path):
+    """The watchfiles path reports created files that match the patterns only."""
+    trigger = FolderMonitorTrigger({"name": "events", "path": str(tmp_path), "patterns": ["*.txt"]})
+    contexts = []
+
+    async def collect(ctx):
+        contexts.append(ctx)
+
+    async def write_files():
+        # Give awatch time to start watching before touching the folder
+        await asyncio.sleep(0.3)
+        (tmp_path / "skip.log").write_text("x")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "nested.txt").write_text("x")
+        (tmp_path / "new.txt").write_text("x")
+
+    writer = asyncio.create_task(write_files())
+    await _run_for(trigger.watch(collect), 1.5)
+    await writer
+    # The write may also surface as a modification, depending on the platform
+    assert {ctx.data["filepath"] for ctx in contexts} == {str(tmp_path / "new.txt")}
+    assert contexts[0].data["event"] == "created"
+
+
+@pytest.mark.parametrize("recursive", [False, True])
+def test_folder_scan_records_mtime_ns(tmp_path, recursive):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    trigger = FolderMonitorTrigger({"name": "scan", "path": str(tmp_path), "recursive": recursive})
+    expected = [tmp_path / "a.txt"] + ([tmp_path / "sub" / "b.txt"] if recursive else [])
+    # Directories are never reported, only files
+    assert trigger._hash_dir() == {str(p): p.stat().st_mtime_ns for p in expected}
+
+
+def test_folder_patterns_match_names_and_paths(tmp_path):
+    trigger = FolderMonitorTrigger({
+        "name": "patterns",
+        "path": str(tmp_path),
+        "recursive": True,
+        "patterns": ["*.txt", "report-?.csv", "logs/*.log"],
+    })
+    for rel in ["a.txt", "report-1.csv", "report-10.csv", "logs/app.log", "app.log", "notes.md"]:
+        (tmp_path / rel).parent.mkdir(exist_ok=True)
+        (tmp_path / rel).write_text("x")
+    matched = {str(Path(p).relative_to(tmp_path)) for p in trigger._hash_dir()}
+    assert matched == {"a.txt", "report-1.csv", os.path.join("logs", "app.log")}
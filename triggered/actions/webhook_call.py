@@ -1,12 +1,41 @@
-from typing import Any
-
-import httpx
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Any
 
 from ..core import Action, TriggerContext, BaseConfig
 from ..registry import register_action
 from ..config_schema import ConfigSchema, ConfigField
 from pydantic import Field
 
+if TYPE_CHECKING:
+    import httpx
+
+
+# One pooled client per event loop, so repeated calls reuse open connections.
+# Connections are bound to the loop that opened them and cannot be shared.
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_client() -> "httpx.AsyncClient":
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        # httpx is heavy to import and only needed once a webhook is sent
+        import httpx
+
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+        _CLIENTS[loop] = client
+    return client
+
+
+async def aclose_client() -> None:
+    """Close the pooled client of the running event loop, if any."""
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
 
 class WebhookCallConfig(BaseConfig):
     """Configuration model for webhook call action."""
@@ -68,8 +97,7 @@ class WebhookCallAction(Action):
         else:
             payload = self._substitute_vars(self.config.payload, ctx)
 
-        async with httpx.AsyncClient() as client:
-            await client.post(url, json=payload, headers=headers)
+        await _get_client().post(url, json=payload, headers=headers)
 
     def _substitute_vars(self, value: Any, ctx: TriggerContext) -> Any:
         """Substitute variables in a value using context data, params, and env vars.
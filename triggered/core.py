@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import abc
 import datetime as _dt
+import functools
 import os
 import re
 import uuid
 from typing import Any, Dict, Optional, TypedDict, Type
 
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
 
 
 class BaseConfig(BaseModel):
@@ -23,6 +24,11 @@ class TriggerContext(BaseModel):
     data: Dict[str, Any] = Field(default_factory=dict)
     params: Dict[str, Any] = Field(default_factory=dict)
 
+    @functools.cached_property
+    def fired_at_iso(self) -> str:
+        """ISO 8601 form of ``fired_at``, formatted once per context."""
+        return self.fired_at.isoformat()
+
     def resolve_env_vars(self, value: str) -> str:
         """Resolve environment variables in a string value.
         
@@ -191,6 +197,17 @@ class TriggerAction(BaseModel):
     action: ActionDefinition
     params: Dict[str, Any] = Field(default_factory=dict)
     filename: Optional[str] = None  # Store the filename of the JSON file
+    _json_cache: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def json_payload(self) -> Dict[str, Any]:
+        """Return ``model_dump(mode="json")``, computed once per instance.
+
+        Trigger-actions are replaced rather than mutated once they are
+        running, so the cached payload stays valid for the object's lifetime.
+        """
+        if self._json_cache is None:
+            self._json_cache = self.model_dump(mode="json")
+        return self._json_cache
 
     def validate(self) -> tuple[bool, str | None]:
         """Validate the entire configuration."""
@@ -90,34 +90,49 @@ def set_log_level(level: str):
         logger.setLevel(level)
         logger.propagate = True
 
+# Handlers installed by setup_logging(), created on the first call
+_file_handler = None
+_console_handler = None
+
 def setup_logging():
-    """Configure logging to both file and console with Rich formatting."""
+    """Configure logging to both file and console with Rich formatting.
+
+    Safe to call more than once: the handlers are created once and only
+    re-attached when something (such as Celery hijacking the root logger)
+    has removed them from the root logger since the last call.
+    """
+    global _file_handler, _console_handler
+    root_logger = logging.getLogger()
+    installed = (_file_handler, _console_handler)
+    if _file_handler is not None and all(h in root_logger.handlers for h in installed):
+        return logger
+
     # Get log level from environment variable, default to INFO
     log_level = os.getenv("TRIGGERED_LOG_LEVEL", "INFO")
     
-    # File handler for raw logs
-    file_handler = logging.FileHandler(LOG_FILE)
-    file_handler.setLevel(logging.DEBUG)  # Always log everything to file
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    file_handler.setFormatter(file_formatter)
-
-    # Rich console handler
-    console_handler = RichHandler(
-        console=console,
-        show_time=True,
-        show_path=False,
-        rich_tracebacks=True,
-        markup=True  # Enable markup in console output
-    )
-    console_handler.setLevel(logging.INFO)  # Default to INFO for console
-
-    # Configure root logger
-    root_logger = logging.getLogger()
+    if _file_handler is None:
+        # File handler for raw logs
+        _file_handler = logging.FileHandler(LOG_FILE)
+        _file_handler.setLevel(logging.DEBUG)  # Always log everything to file
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        _file_handler.setFormatter(file_formatter)
+
+        # Rich console handler
+        _console_handler = RichHandler(
+            console=console,
+            show_time=True,
+            show_path=False,
+            rich_tracebacks=True,
+            markup=True  # Enable markup in console output
+        )
+        _console_handler.setLevel(logging.INFO)  # Default to INFO for console
+
+    # Configure root logger; addHandler skips a handler that is still attached
     root_logger.setLevel(logging.DEBUG)  # Capture all levels
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(_file_handler)
+    root_logger.addHandler(_console_handler)
 
     # Configure specific loggers
     loggers = {
@@ -135,9 +150,9 @@ def setup_logging():
     }
 
     for logger_name, level in loggers.items():
-        logger = logging.getLogger(logger_name)
-        logger.setLevel(level)
-        logger.propagate = True  # Ensure logs propagate to parent loggers
+        named_logger = logging.getLogger(logger_name)
+        named_logger.setLevel(level)
+        named_logger.propagate = True  # Ensure logs propagate to parent loggers
 
     # Set initial log level from environment
     set_log_level(log_level)
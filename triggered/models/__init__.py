@@ -1,14 +1,84 @@
 import asyncio
+import copy
 import logging
-from typing import Dict, Any, Optional, List, Union
+from typing import AsyncIterator, Dict, Any, Optional, List, Union
 import os
-from litellm import completion, ModelResponse
-from ..tools import TOOL_REGISTRY
+import weakref
+from ..tools import TOOL_REGISTRY, get_tool_instance
 from ..logging_config import logger
-import json
+import re
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Patterns used to pull JSON out of free-form model output
+_JSON_CODE_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+# Fast path for the usual ```json fence laid out on its own lines
+_JSON_FENCE_RE = re.compile(r'```json\n(\{.*?\})\n```', re.DOTALL)
+_WS_RE = re.compile(r'\s+')
+_TRAILING_COMMA_RE = re.compile(r',\s*}')
+
+
+def _iter_json_spans(text: str):
+    """Yield balanced top-level ``{...}`` substrings of ``text``.
+
+    Single pass over the text tracking brace depth, skipping braces that
+    appear inside JSON strings, so nested objects are returned whole.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            if depth:
+                in_string = True
+        elif ch == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
+
+# Maximum number of characters of a model response included in error logs
+_LOG_PREVIEW_CHARS = 1024
+
+
+def _preview(value: Any) -> str:
+    """Return a truncated string form of ``value`` for log messages."""
+    return str(value)[:_LOG_PREVIEW_CHARS]
+
+
+# Defaults for LiteLLMModel, read once at import
+_DEFAULT_MODEL = os.getenv("LITELLM_MODEL", "openai/gpt-4o")
+_DEFAULT_API_BASE = os.getenv("LITELLM_API_BASE", "")
+_MAX_CONCURRENT = int(os.getenv("TRIGGERED_MAX_CONCURRENT", "8"))
+
+# Artificial latency of the DummyModel, useful to simulate a slow backend
+_DUMMY_LATENCY = float(os.getenv("TRIGGERED_DUMMY_LATENCY_MS", "0")) / 1000.0
+
+_litellm_acompletion = None
+
+
+def _load_litellm():
+    """Import LiteLLM on first use; importing it pulls in every provider SDK."""
+    global _litellm_acompletion
+    if _litellm_acompletion is None:
+        from litellm import acompletion
+        _litellm_acompletion = acompletion
+    return _litellm_acompletion
+
 
 class BaseModelAdapter:
     async def ainvoke(self, prompt: str, **kwargs):  # noqa: D401
@@ -17,8 +87,9 @@ class BaseModelAdapter:
 
 class DummyModel(BaseModelAdapter):
     async def ainvoke(self, prompt: str, **kwargs):  # noqa: D401
-        await asyncio.sleep(0.1)
-        logger.info("Dummy model received prompt: %s", prompt)
+        if _DUMMY_LATENCY:
+            await asyncio.sleep(_DUMMY_LATENCY)
+        logger.debug("Dummy model received prompt: %s", prompt)
         return "yes"
 
 
@@ -31,33 +102,45 @@ class LiteLLMModel(BaseModelAdapter):
         api_base: str | None = None,
         **kwargs
     ) -> None:
-        self.model = model or os.getenv("LITELLM_MODEL", "openai/gpt-4o")
-        self.api_base = api_base or os.getenv("LITELLM_API_BASE", "")
+        self.model = model or _DEFAULT_MODEL
+        self.api_base = api_base or _DEFAULT_API_BASE
         self.kwargs = kwargs
+        self._acompletion = _load_litellm()
+        # Bound concurrent requests so a burst of ainvoke calls doesn't overload the backend.
+        # Adapters are shared by every event loop in the process (server, worker,
+        # asyncio.run), and a semaphore is bound to one loop, so keep one per loop.
+        self._sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        # In-flight requests keyed by (prompt, tools) so identical concurrent calls share one completion
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # Converted tool lists keyed by the tuple of tool types they were built from;
+        # deep-copied out so callers can't mutate the cached entry
+        self._tools_cache: Dict[tuple, List[Dict[str, Any]]] = {}
 
     def _convert_tools_to_litellm_format(self, tool_configs: List[Union[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
         """Convert tool configurations to LiteLLM format."""
+        # Handle both string and object formats
+        tool_types = tuple(
+            config if isinstance(config, str) else config.get("type")
+            for config in tool_configs
+        )
+        cached = self._tools_cache.get(tool_types)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        registry = TOOL_REGISTRY
         tools = []
-        for config in tool_configs:
-            # Handle both string and object formats
-            if isinstance(config, str):
-                tool_type = config
-            else:
-                tool_type = config.get("type")
-                
-            if tool_type not in TOOL_REGISTRY:
+        for tool_type in tool_types:
+            tool_cls = registry.get(tool_type)
+            if tool_cls is None:
                 logger.warning("Unknown tool type: %s", tool_type)
                 continue
                 
-            tool_cls = TOOL_REGISTRY[tool_type]
-            tools.append({
-                "type": "function",
-                "function": {
-                    "name": tool_cls.name,
-                    "description": tool_cls.description,
-                    "parameters": tool_cls.args_schema.model_json_schema(),
-                }
-            })
+            tools.append(tool_cls.get_function_schema())
+
+        # Only cache fully resolved lists so tools registered later are still picked up
+        if len(tools) == len(tool_types):
+            self._tools_cache[tool_types] = tools
+            return copy.deepcopy(tools)
         return tools
 
     def _extract_json_from_text(self, text: str) -> Optional[str]:
@@ -66,60 +149,52 @@ class LiteLLMModel(BaseModelAdapter):
         Looks for JSON objects in the text, either as a complete JSON string
         or as a code block with JSON content.
         """
-        # Try to parse the entire text as JSON first
-        try:
-            json.loads(text)
-            return text
-        except json.JSONDecodeError:
-            pass
-
-        # Look for JSON in code blocks
-        import re
-        # Match JSON in code blocks, handling multiline content
-        json_pattern = r'```(?:json)?\s*(\{[\s\S]*?\})\s*```'
-        matches = re.findall(json_pattern, text)
-        if matches:
+        # Try to parse the entire text as JSON first, but only if it can be JSON
+        stripped = text.strip()
+        if stripped and stripped[0] in '{[':
+            try:
+                orjson.loads(stripped)
+                return text
+            except orjson.JSONDecodeError:
+                pass
+
+        # Look for JSON in code blocks, handling multiline content
+        match = None
+        if '```' in text:
+            match = _JSON_FENCE_RE.search(text) or _JSON_CODE_BLOCK_RE.search(text)
+        if match:
             try:
                 # Clean up the matched JSON string
-                json_str = matches[0]
+                json_str = match.group(1)
                 # Remove any leading/trailing whitespace and newlines
                 json_str = json_str.strip()
                 # Parse to validate it's JSON
-                json.loads(json_str)
+                orjson.loads(json_str)
                 return json_str
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # If parsing fails, try to clean up the JSON string
                 try:
                     # Remove any extra whitespace between properties
-                    json_str = re.sub(r'\s+', ' ', json_str)
+                    json_str = _WS_RE.sub(' ', json_str)
                     # Remove any trailing commas
-                    json_str = re.sub(r',\s*}', '}', json_str)
+                    json_str = _TRAILING_COMMA_RE.sub('}', json_str)
                     # Try parsing again
-                    json.loads(json_str)
+                    orjson.loads(json_str)
                     return json_str
-                except json.JSONDecodeError:
-                    logger.error("Failed to parse JSON from code block: %s", json_str)
+                except orjson.JSONDecodeError:
+                    if logger.isEnabledFor(logging.ERROR):
+                        logger.error("Failed to parse JSON from code block: %s", _preview(json_str))
                     pass
 
         # If no JSON found in code blocks, try to find any JSON-like structure
-        try:
-            # Look for anything that looks like a JSON object
-            json_pattern = r'(\{[\s\S]*?\})'
-            matches = re.findall(json_pattern, text)
-            if matches:
-                for match in matches:
-                    try:
-                        # Clean up the potential JSON string
-                        json_str = match.strip()
-                        # Remove any extra whitespace
-                        json_str = re.sub(r'\s+', ' ', json_str)
-                        # Try parsing
-                        json.loads(json_str)
-                        return json_str
-                    except json.JSONDecodeError:
-                        continue
-        except Exception as e:
-            logger.error("Error while searching for JSON: %s", str(e))
+        if '{' not in text:
+            return None
+        for candidate in _iter_json_spans(text):
+            try:
+                orjson.loads(candidate)
+                return candidate
+            except orjson.JSONDecodeError:
+                continue
 
         return None
 
@@ -134,108 +209,144 @@ class LiteLLMModel(BaseModelAdapter):
             }
         }
 
-    async def ainvoke(self, prompt: str, tools: list | None = None) -> str:
-        try:
-            messages = [{"role": "user", "content": prompt}]
-            
-            # If tools are provided, convert them to LiteLLM format and add to system message
-            litellm_tools = None
-            if tools:
-                litellm_tools = self._convert_tools_to_litellm_format(tools)
-                system_message = {
-                    "role": "system",
-                    "content": "You have access to the following tools:",
-                    "tools": litellm_tools
-                }
-                messages.insert(0, system_message)
-
-            # DEBUG: Log the outgoing request
-            logger.debug(f"Sending to LiteLLM: messages={messages}, tools={litellm_tools}")
-            
-            # Run the completion in a thread pool since it's sync
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: completion(
-                    tools=litellm_tools,
-                    model=self.model,
-                    messages=messages,
-                    api_base=self.api_base,
-                    **self.kwargs
-                )
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency limit for the running event loop."""
+        loop = asyncio.get_running_loop()
+        sem = self._sems.get(loop)
+        if sem is None:
+            sem = self._sems[loop] = asyncio.Semaphore(_MAX_CONCURRENT)
+        return sem
+
+    async def _complete(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]] | None = None):
+        """Run a single LiteLLM completion."""
+        async with self._semaphore():
+            return await self._acompletion(
+                tools=tools,
+                model=self.model,
+                messages=messages,
+                api_base=self.api_base,
+                **self.kwargs
             )
+
+    def _extract_message(self, response) -> tuple[Any, str | None]:
+        """Return the first choice message of a response as (message, error)."""
+        choices = getattr(response, "choices", None)
+        if not choices:
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error("No choices in LiteLLM response (%s): %s", type(response), _preview(response))
+            return None, "Error: No response from model"
+
+        return choices[0].message, None
+
+    async def ainvoke(self, prompt: str, tools: list | None = None, expect_json: bool = False) -> str:
+        """Invoke the model, sharing the result between identical concurrent calls.
+
+        When ``expect_json`` is set, a JSON object embedded in the response
+        text is extracted and returned instead of the full text.
+        """
+        key = (prompt, orjson.dumps(tools or [], option=orjson.OPT_SORT_KEYS), expect_json)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._ainvoke(prompt, tools, expect_json))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so a cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _build_messages(self, prompt: str, tools: list | None) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]] | None]:
+        """Build the initial conversation and the LiteLLM tool specs."""
+        messages = [{"role": "user", "content": prompt}]
+
+        # If tools are provided, convert them to LiteLLM format and add to system message;
+        # when none of them resolve, skip the system message and send no tools at all
+        litellm_tools = self._convert_tools_to_litellm_format(tools) if tools else None
+        if litellm_tools:
+            system_message = {
+                "role": "system",
+                "content": "You have access to the following tools:",
+                "tools": litellm_tools
+            }
+            messages.insert(0, system_message)
+        else:
+            litellm_tools = None
+
+        # DEBUG: Log the outgoing request
+        logger.debug("Sending to LiteLLM: messages=%s, tools=%s", messages, litellm_tools)
+        return messages, litellm_tools
+
+    async def _run_tool_calls(self, message, messages: List[Dict[str, Any]]) -> str | None:
+        """Execute the tool calls of ``message`` and append the results to ``messages``.
+
+        Returns an error string if a call cannot be dispatched, otherwise None.
+        """
+        logger.info("Tool calls detected: %s", message.tool_calls)
+
+        # Convert tool calls to dictionary format to avoid Pydantic warnings
+        tool_calls_dict = [self._convert_tool_call_to_dict(tc) for tc in message.tool_calls]
+
+        # Add the assistant's message to the conversation
+        messages.append({
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": tool_calls_dict
+        })
+
+        # Validate and decode every call before starting any of them
+        registry = TOOL_REGISTRY
+        parsed_calls = []
+        for tool_call in message.tool_calls:
+            tool_name = tool_call.function.name
+            if tool_name not in registry:
+                logger.error("Unknown tool called: %s", tool_name)
+                return "Error: Unknown tool called"
+            parsed_calls.append((tool_name, orjson.loads(tool_call.function.arguments)))
+
+        # Start every tool call; they are independent, so run them concurrently
+        calls = []
+        for tool_name, tool_args in parsed_calls:
+            logger.info("Executing tool: %s with args: %s", tool_name, tool_args)
+            calls.append(get_tool_instance(tool_name)._call(**tool_args))
+
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        # Add the tool responses to the conversation in the original order
+        for tool_call, result in zip(message.tool_calls, results):
+            if isinstance(result, BaseException):
+                raise result
+
+            logger.info("Tool result: %s", result)
+
+            messages.append({
+                "tool_call_id": tool_call.id,
+                "role": "tool",
+                "name": tool_call.function.name,
+                "content": orjson.dumps(result).decode()
+            })
+        return None
+
+    async def _ainvoke(self, prompt: str, tools: list | None = None, expect_json: bool = False) -> str:
+        try:
+            messages, litellm_tools = self._build_messages(prompt, tools)
             
-            if not isinstance(response, ModelResponse):
-                logger.error("Invalid response type from LiteLLM: %s", type(response))
-                return "Error: Invalid response from model"
-                
-            if not response.choices:
-                logger.error("No choices in LiteLLM response: %s", response)
-                return "Error: No response from model"
-                
-            message = response.choices[0].message
+            response = await self._complete(messages, tools=litellm_tools)
+            message, error = self._extract_message(response)
+            if error:
+                return error
             
             # Handle tool calls
             if message.tool_calls:
-                logger.info("Tool calls detected: %s", message.tool_calls)
-                
-                # Convert tool calls to dictionary format to avoid Pydantic warnings
-                tool_calls_dict = [self._convert_tool_call_to_dict(tc) for tc in message.tool_calls]
-                
-                # Add the assistant's message to the conversation
-                messages.append({
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": tool_calls_dict
-                })
-                
-                # Process each tool call
-                for tool_call in message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-                    
-                    logger.info("Executing tool: %s with args: %s", tool_name, tool_args)
-                    
-                    if tool_name not in TOOL_REGISTRY:
-                        logger.error("Unknown tool called: %s", tool_name)
-                        return "Error: Unknown tool called"
-                        
-                    tool_cls = TOOL_REGISTRY[tool_name]
-                    tool_instance = tool_cls()
-                    result = await tool_instance._call(**tool_args)
-                    
-                    logger.info("Tool result: %s", result)
-                    
-                    # Add the tool response to the conversation
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": tool_name,
-                        "content": json.dumps(result)
-                    })
+                error = await self._run_tool_calls(message, messages)
+                if error:
+                    return error
                 
                 # Get a new response from the model with the tool results
-                second_response = await loop.run_in_executor(
-                    None,
-                    lambda: completion(
-                        model=self.model,
-                        messages=messages,
-                        api_base=self.api_base,
-                        **self.kwargs
-                    )
-                )
-                
-                if not isinstance(second_response, ModelResponse):
-                    logger.error("Invalid response type from second LiteLLM call: %s", type(second_response))
-                    return "Error: Invalid response from model"
-                    
-                if not second_response.choices:
-                    logger.error("No choices in second LiteLLM response: %s", second_response)
-                    return "Error: No response from model"
-                    
-                final_message = second_response.choices[0].message
+                second_response = await self._complete(messages)
+                final_message, error = self._extract_message(second_response)
+                if error:
+                    return error
                 if not final_message.content:
-                    logger.error("No content in final LiteLLM response: %s", second_response)
+                    if logger.isEnabledFor(logging.ERROR):
+                        logger.error("No content in final LiteLLM response: %s", _preview(second_response))
                     return "Error: Empty response from model"
                     
                 return final_message.content
@@ -243,9 +354,13 @@ class LiteLLMModel(BaseModelAdapter):
             # Handle regular content
             content = message.content
             if not content:
-                logger.error("No content in LiteLLM response: %s", response)
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error("No content in LiteLLM response: %s", _preview(response))
                 return "Error: Empty response from model"
             
+            if not expect_json:
+                return content
+
             # Try to extract JSON from the content
             json_content = self._extract_json_from_text(content)
             if json_content:
@@ -255,9 +370,64 @@ class LiteLLMModel(BaseModelAdapter):
             return content
             
         except Exception as e:
-            logger.error("LiteLLM API error: %s", str(e))
+            logger.error("LiteLLM API error: %s", e)
             return f"Error: {str(e)}"
 
+    async def astream(self, prompt: str, tools: list | None = None) -> AsyncIterator[str]:
+        """Invoke the model and yield the answer text as it is generated.
+
+        Tool calls are resolved first; the completion that follows them is
+        streamed, so callers can act on the first tokens before the model
+        has finished. ``ainvoke`` remains the non-streaming entry point.
+        """
+        try:
+            messages, litellm_tools = self._build_messages(prompt, tools)
+
+            response = await self._complete(messages, tools=litellm_tools)
+            message, error = self._extract_message(response)
+            if error:
+                yield error
+                return
+
+            if not message.tool_calls:
+                # The answer is already complete; nothing left to stream
+                yield message.content or "Error: Empty response from model"
+                return
+
+            error = await self._run_tool_calls(message, messages)
+            if error:
+                yield error
+                return
+
+            # Hold a model slot only while talking to the backend, never while
+            # the caller consumes a chunk, so a slow reader can't starve others
+            sem = self._semaphore()
+            async with sem:
+                stream = await self._acompletion(
+                    model=self.model,
+                    messages=messages,
+                    api_base=self.api_base,
+                    stream=True,
+                    **self.kwargs
+                )
+            chunks = stream.__aiter__()
+            while True:
+                async with sem:
+                    try:
+                        chunk = await chunks.__anext__()
+                    except StopAsyncIteration:
+                        break
+                choices = getattr(chunk, "choices", None)
+                if not choices:
+                    continue
+                delta = choices[0].delta.content
+                if delta:
+                    yield delta
+
+        except Exception as e:
+            logger.error("LiteLLM API error: %s", e)
+            yield f"Error: {str(e)}"
+
 
 # fallback detection
 try:
@@ -267,7 +437,21 @@ except Exception:
     _LITELLM_AVAILABLE = False
 
 
-_MODEL_CACHE: Dict[str, BaseModelAdapter] = {}
+# Maximum number of model instances kept by get_model
+_MODEL_CACHE_SIZE = 128
+_MODEL_CACHE: Dict[tuple, BaseModelAdapter] = {}
+
+
+def _kwargs_key(kwargs: Dict[str, Any]) -> tuple:
+    """Return a hashable key for model keyword arguments."""
+    items = []
+    for key, value in sorted(kwargs.items()):
+        try:
+            hash(value)
+        except TypeError:
+            value = repr(value)
+        items.append((key, value))
+    return tuple(items)
 
 
 def get_model(
@@ -280,9 +464,9 @@ def get_model(
     Parameters
     ----------
     model : str | None
-        Model name (e.g. "ollama/llama3.1"). Defaults to LITELLM_MODEL env var or "ollama/llama3.1"
+        Model name (e.g. "ollama/llama3.1"). Defaults to LITELLM_MODEL env var or "openai/gpt-4o"
     api_base : str | None
-        API base URL. Defaults to LITELLM_API_BASE env var or "http://localhost:11434"
+        API base URL. Defaults to LITELLM_API_BASE env var or the provider default
     **kwargs
         Additional arguments to pass to the model
         
@@ -291,19 +475,23 @@ def get_model(
     BaseModelAdapter
         Configured model instance
     """
-    # Create a cache key from the model name and API base
-    cache_key = f"{model}:{api_base}"
+    # Resolve defaults first so explicit and implicit defaults share an instance
+    model = model or _DEFAULT_MODEL
+    api_base = api_base or _DEFAULT_API_BASE
+    cache_key = (model, api_base, _kwargs_key(kwargs))
     
     # Check if we have a cached instance
     if cache_key in _MODEL_CACHE:
         return _MODEL_CACHE[cache_key]
     
-    # Create a new instance
+    # Create a new instance; DISABLE_OLLAMA is read per call so it can be toggled at runtime
     if os.getenv("DISABLE_OLLAMA") == "1":
         instance = DummyModel()
     else:
         instance = LiteLLMModel(model=model, api_base=api_base, **kwargs)
     
-    # Cache the instance
+    # Cache the instance, evicting the oldest entry once the cache is full
+    if len(_MODEL_CACHE) >= _MODEL_CACHE_SIZE:
+        _MODEL_CACHE.pop(next(iter(_MODEL_CACHE)))
     _MODEL_CACHE[cache_key] = instance
     return instance 
\ No newline at end of file
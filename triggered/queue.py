@@ -5,9 +5,13 @@ import sys
 import socket
 from pathlib import Path
 
+import orjson
 from celery import Celery
 from celery.signals import (
+    after_setup_logger,
     worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
     task_received,
     before_task_publish,
     after_task_publish,
@@ -15,6 +19,14 @@ from celery.signals import (
     task_failure
 )
 
+from kombu.serialization import register as register_serializer
+from pydantic import TypeAdapter
+
+try:
+    import uvloop  # type: ignore
+except ImportError:  # pragma: no cover - not available on Windows
+    uvloop = None
+
 from .core import TriggerAction, TriggerContext
 from .registry import get_action
 from .logging_config import log_action_start, log_action_result, log_result_details, logger, setup_logging
@@ -23,9 +35,27 @@ from .logging_config import log_action_start, log_action_result, log_result_deta
 data_dir = Path(os.getenv("TRIGGERED_DATA_DIR", "data"))
 data_dir.mkdir(parents=True, exist_ok=True)
 
-# Use SQLite as broker and backend
-broker_url = f"sqla+sqlite:///{data_dir}/celery.sqlite"
-backend_url = f"db+sqlite:///{data_dir}/celery_results.sqlite"
+# Use SQLite as broker and backend unless configured otherwise
+broker_url = os.getenv("TRIGGERED_BROKER_URL", f"sqla+sqlite:///{data_dir}/celery.sqlite")
+backend_url = os.getenv("TRIGGERED_BACKEND_URL", f"db+sqlite:///{data_dir}/celery_results.sqlite")
+
+# Number of tasks a worker process handles before it is replaced
+MAX_TASKS_PER_CHILD = int(os.getenv("TRIGGERED_MAX_TASKS_PER_CHILD", "500"))
+
+
+def _orjson_dumps(obj) -> bytes:
+    # Payloads and action results may carry dicts with int or other non-str keys
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Serialize task messages and results with orjson instead of the stdlib json module
+register_serializer(
+    "orjson",
+    _orjson_dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="binary",
+)
 
 # Get hostname for worker identification
 hostname = socket.gethostname()
@@ -45,9 +75,9 @@ app.conf.update(
     worker_redirect_stdouts_level='INFO',  # Log level for redirected output
     
     # Task configuration
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer='orjson',
+    accept_content=['orjson', 'json'],
+    result_serializer='orjson',
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
@@ -63,7 +93,7 @@ app.conf.update(
     
     # Worker configuration
     worker_prefetch_multiplier=1,  # Process one task at a time
-    worker_max_tasks_per_child=1,  # Restart worker after each task
+    worker_max_tasks_per_child=MAX_TASKS_PER_CHILD,  # Amortize worker startup over many tasks
     worker_max_memory_per_child=512000,  # Restart worker if memory exceeds 512MB
     worker_concurrency=1,  # Only one worker process
     worker_pool='solo',  # Use solo pool to prevent duplicate execution
@@ -108,32 +138,75 @@ app.conf.update(
     }
 )
 
+# Event loop reused by every task run in this worker process
+_loop = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the worker's event loop, creating it on first use."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        # uvloop ships with uvicorn[standard]; fall back to the stdlib loop without it
+        _loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+# Validators built once per process and reused by every task
+_TA_ADAPTER = TypeAdapter(TriggerAction)
+_CTX_ADAPTER = TypeAdapter(TriggerContext)
+
+@after_setup_logger.connect
 @worker_process_init.connect
 def setup_worker_logging(**kwargs):
-    """Set up logging for each worker process."""
+    """Set up logging for each worker process.
+
+    ``after_setup_logger`` fires once Celery has configured (and, by default,
+    cleared) the root logger, so the handlers are installed after that reset
+    rather than before it. ``worker_process_init`` covers each pool process,
+    including prefork children that did not run Celery's logging setup.
+    """
     setup_logging()
+
+    # Ensure stdout/stderr are properly configured; Celery may have replaced
+    # them with proxies that have no reconfigure()
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, "reconfigure"):
+            stream.reconfigure(line_buffering=True)
     logger.info(f"Celery worker process initialized on {hostname}")
 
-@before_task_publish.connect
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def close_worker_loop(**kwargs):
+    """Close the worker's event loop when the worker process exits."""
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+        _loop.close()
+    _loop = None
+
 def before_task_publish_handler(sender=None, headers=None, **kwargs):
     """Log when a task is about to be published."""
     logger.debug(f"Task about to be published: {sender} (ID: {headers.get('id')})")
 
-@after_task_publish.connect
 def after_task_publish_handler(sender=None, headers=None, **kwargs):
     """Log when a task has been published."""
     logger.debug(f"Task published: {sender} (ID: {headers.get('id')})")
 
-@task_received.connect
 def task_received_handler(sender=None, request=None, **kwargs):
     """Log when a task is received by the worker."""
     logger.debug(f"Task received: {request.name} (ID: {request.id})")
 
-@task_success.connect
 def task_success_handler(sender=None, **kwargs):
     """Log when a task completes successfully."""
     logger.debug(f"Task succeeded: {sender.name} (ID: {sender.request.id})")
 
+# The lifecycle handlers above only emit debug logs, so they are opt-in
+if os.getenv("TRIGGERED_ENABLE_SIGNAL_LOGGING") == "1":
+    before_task_publish.connect(before_task_publish_handler)
+    after_task_publish.connect(after_task_publish_handler)
+    task_received.connect(task_received_handler)
+    task_success.connect(task_success_handler)
+
 @task_failure.connect
 def task_failure_handler(sender=None, exception=None, **kwargs):
     """Log when a task fails."""
@@ -142,21 +215,14 @@ def task_failure_handler(sender=None, exception=None, **kwargs):
 @app.task(name="triggered.execute_action", bind=True, queue='triggered', max_retries=3)
 def execute_action(self, ta_dict: dict, ctx_dict: dict):  # noqa: D401
     """Celery task that instantiates and executes an Action."""
-    # Set up logging for the Celery worker
-    setup_logging()
-    
-    # Ensure stdout/stderr are properly configured
-    sys.stdout.reconfigure(line_buffering=True)
-    sys.stderr.reconfigure(line_buffering=True)
-    
     logger.debug(f"Starting action execution in Celery worker (Task ID: {self.request.id})")
     
     try:
-        ta = TriggerAction.model_validate(ta_dict)  # type: ignore[attr-defined]
-        ctx = TriggerContext.model_validate(ctx_dict)  # type: ignore[attr-defined]
+        ta = _TA_ADAPTER.validate_python(ta_dict)
+        ctx = _CTX_ADAPTER.validate_python(ctx_dict)
 
         # Run action synchronously within celery worker event loop
-        result = asyncio.run(ta.execute_action(ctx))
+        result = _get_loop().run_until_complete(ta.execute_action(ctx))
         logger.debug(f"Action execution completed successfully (Task ID: {self.request.id})")
         return result
     except Exception as e:
@@ -1,4 +1,7 @@
-from typing import Dict, Type, Callable, Any, Union, Optional
+from __future__ import annotations
+
+import functools
+from typing import Callable, Dict, Type
 
 from .core import Trigger, Action
 from .tools import Tool
@@ -8,7 +11,7 @@ ACTION_REGISTRY: Dict[str, Type[Action]] = {}
 TOOL_REGISTRY: Dict[str, Type[Tool]] = {}
 
 
-def register_trigger(name: Optional[str] = None, trigger_cls: Optional[Type[Trigger]] = None) -> Union[Callable[[Type[Trigger]], Type[Trigger]], None]:
+def register_trigger(name: str | None = None, trigger_cls: Type[Trigger] | None = None) -> Callable[[Type[Trigger]], Type[Trigger]] | None:
     """Register a trigger class. Can be used as a decorator or direct function call.
     
     When used as a decorator:
@@ -21,16 +24,18 @@ def register_trigger(name: Optional[str] = None, trigger_cls: Optional[Type[Trig
     """
     def decorator(cls: Type[Trigger]) -> Type[Trigger]:
         TRIGGER_REGISTRY[name] = cls
+        get_trigger.cache_clear()
         return cls
         
     if trigger_cls is None:
         return decorator
     else:
         TRIGGER_REGISTRY[name] = trigger_cls
+        get_trigger.cache_clear()
         return None
 
 
-def register_action(name: Optional[str] = None, action_cls: Optional[Type[Action]] = None) -> Union[Callable[[Type[Action]], Type[Action]], None]:
+def register_action(name: str | None = None, action_cls: Type[Action] | None = None) -> Callable[[Type[Action]], Type[Action]] | None:
     """Register an action class. Can be used as a decorator or direct function call.
     
     When used as a decorator:
@@ -43,36 +48,46 @@ def register_action(name: Optional[str] = None, action_cls: Optional[Type[Action
     """
     def decorator(cls: Type[Action]) -> Type[Action]:
         ACTION_REGISTRY[name] = cls
+        get_action.cache_clear()
         return cls
         
     if action_cls is None:
         return decorator
     else:
         ACTION_REGISTRY[name] = action_cls
+        get_action.cache_clear()
         return None
 
 
 def register_tool(name: str, tool_cls: Type[Tool]) -> None:
     """Register a tool class."""
     TOOL_REGISTRY[name] = tool_cls
+    get_tool.cache_clear()
 
 
+# Lookups are cached; the register_* functions clear the matching cache.
+@functools.lru_cache(maxsize=None)
 def get_trigger(name: str) -> Type[Trigger]:
     """Get a trigger class by name."""
-    if name not in TRIGGER_REGISTRY:
+    cls = TRIGGER_REGISTRY.get(name)
+    if cls is None:
         raise ValueError(f"Unknown trigger type: {name}")
-    return TRIGGER_REGISTRY[name]
+    return cls
 
 
+@functools.lru_cache(maxsize=None)
 def get_action(name: str) -> Type[Action]:
     """Get an action class by name."""
-    if name not in ACTION_REGISTRY:
+    cls = ACTION_REGISTRY.get(name)
+    if cls is None:
         raise ValueError(f"Unknown action type: {name}")
-    return ACTION_REGISTRY[name]
+    return cls
 
 
+@functools.lru_cache(maxsize=None)
 def get_tool(name: str) -> Type[Tool]:
     """Get a tool class by name."""
-    if name not in TOOL_REGISTRY:
+    cls = TOOL_REGISTRY.get(name)
+    if cls is None:
         raise ValueError(f"Unknown tool type: {name}")
-    return TOOL_REGISTRY[name] 
\ No newline at end of file
+    return cls 
\ No newline at end of file
@@ -1,52 +1,85 @@
 import asyncio
-import json
 import logging
 import os
-import signal
-import subprocess
 import sys
 import time
 import socket
+from collections import deque, namedtuple
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Deque, Dict, List, Optional
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.routing import APIRoute
+from fastapi.responses import ORJSONResponse
 from starlette.requests import Request as StarletteRequest
 from starlette.responses import Response
-try:
-    from opentelemetry import trace  # type: ignore
-    from opentelemetry.instrumentation.fastapi import (  # type: ignore
-        FastAPIInstrumentor,
-    )
-    from opentelemetry.sdk.resources import Resource  # type: ignore
-    from opentelemetry.sdk.trace import TracerProvider  # type: ignore
-    from opentelemetry.sdk.trace.export import (  # type: ignore
-        BatchSpanProcessor,
-        ConsoleSpanExporter,
-    )
-except ImportError:  # pragma: no cover
-    trace = None  # type: ignore
-    FastAPIInstrumentor = None  # type: ignore
-    Resource = None  # type: ignore
-    TracerProvider = None  # type: ignore
-    BatchSpanProcessor = ConsoleSpanExporter = None  # type: ignore
-
-from .core import TriggerAction
-from .queue import app as celery_app, execute_action
+from starlette.routing import Route
+
+from .core import Trigger, TriggerAction, TriggerContext
 from .registry import get_trigger
 from .logging_config import logger
 
 TRIGGER_ACTIONS_DIR = Path(os.getenv("TRIGGERED_TRIGGER_ACTIONS_PATH", "enabled_trigger_actions"))
-TRIGGER_ACTIONS_DIR.mkdir(parents=True, exist_ok=True)
 
 # Environment variable to control whether to start the Celery worker
 START_WORKER = os.getenv("TRIGGERED_START_WORKER", "true").lower() == "true"
 
-app = FastAPI(title="Triggered Runtime Engine")
+# Maximum number of fired events waiting for dispatch
+QUEUE_MAX = int(os.getenv("TRIGGERED_QUEUE_MAX", "10000"))
+
+# Maximum number of queued events published to Celery in one go
+DISPATCH_BATCH_SIZE = int(os.getenv("TRIGGERED_DISPATCH_BATCH_SIZE", "64"))
+# How long the dispatcher waits for more events before sending a batch
+DISPATCH_WINDOW = int(os.getenv("TRIGGERED_DISPATCH_WINDOW_MS", "10")) / 1000
+# Drop events repeating the same trigger-action and data within one batch
+DISPATCH_DEDUP = os.getenv("TRIGGERED_DEDUP", "0") == "1"
+
+# How long requests wait for the runtime to finish starting before getting a 503
+STARTUP_TIMEOUT = float(os.getenv("TRIGGERED_STARTUP_TIMEOUT", "300"))
+
+# Endpoints that answer while trigger-actions are still being loaded
+UNGATED_PATHS = frozenset({"/status"})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await on_startup()
+    yield
+    await on_shutdown()
+
+
+app = FastAPI(
+    title="Triggered Runtime Engine",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+tracer = None
+
+
+def _setup_telemetry():
+    """Setup OpenTelemetry console exporter (for demo).
+
+    The OpenTelemetry packages are only imported when TRIGGERED_OTEL=1.
+    """
+    global tracer
+    try:
+        from opentelemetry import trace  # type: ignore
+        from opentelemetry.instrumentation.fastapi import (  # type: ignore
+            FastAPIInstrumentor,
+        )
+        from opentelemetry.sdk.resources import Resource  # type: ignore
+        from opentelemetry.sdk.trace import TracerProvider  # type: ignore
+        from opentelemetry.sdk.trace.export import (  # type: ignore
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+        )
+    except ImportError:  # pragma: no cover
+        logger.warning("TRIGGERED_OTEL is set but OpenTelemetry is not installed")
+        return
 
-# Setup OpenTelemetry console exporter (for demo)
-if trace and FastAPIInstrumentor:
     processor = BatchSpanProcessor(ConsoleSpanExporter())
     provider = TracerProvider(
         resource=Resource.create({"service.name": "triggered"}),
@@ -57,182 +90,376 @@ if trace and FastAPIInstrumentor:
     trace.set_tracer_provider(provider)
     FastAPIInstrumentor.instrument_app(app)
     tracer = trace.get_tracer(__name__)
-else:
-    tracer = None
 
-# In-memory store of recent events
-RECENT_EVENTS: List[Dict] = []
 
-# Store the worker process
-worker_process: Optional[subprocess.Popen] = None
+# Instrumentation adds middleware, so it has to happen before the app starts
+if os.getenv("TRIGGERED_OTEL", "0") == "1":
+    _setup_telemetry()
+
+# In-memory ring buffer of recent events
+MAX_EVENTS = int(os.getenv("TRIGGERED_MAX_EVENTS", "10000"))
+Event = namedtuple("Event", "id time")
+RECENT_EVENTS: Deque[Event] = deque(maxlen=MAX_EVENTS)
+
+# Store the worker process and the tasks forwarding its output
+worker_process: Optional[asyncio.subprocess.Process] = None
+_worker_output_tasks: List[asyncio.Task] = []
+
+
+def _read_trigger_file(path: Path):
+    """Parse a trigger-action file, returning the exception instead of raising."""
+    try:
+        # Validate straight from the raw bytes; pydantic parses the JSON itself
+        return TriggerAction.model_validate_json(path.read_bytes())
+    except Exception as exc:  # noqa: WPS420
+        return exc
+
+
+def _write_trigger_file(file_path: Path, payload: Dict):
+    """Write a trigger-action file atomically, so a crash never leaves it half written."""
+    tmp_path = file_path.with_suffix(".json.tmp")
+    tmp_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, file_path)
+
+
+def _dedup_batch(batch: List[tuple]) -> List[tuple]:
+    """Keep the first event for each (trigger-action, data) pair in a batch."""
+    seen = set()
+    unique = []
+    for ta, ctx in batch:
+        try:
+            key = (ta.id, orjson.dumps(ctx.data, option=orjson.OPT_SORT_KEYS))
+        except TypeError:
+            # Data orjson cannot encode is never treated as a duplicate
+            unique.append((ta, ctx))
+            continue
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append((ta, ctx))
+    if len(unique) < len(batch):
+        logger.debug("Dropped %d duplicate events from dispatch batch", len(batch) - len(unique))
+    return unique
+
+
+def _send_to_celery(ta: TriggerAction, ctx: TriggerContext, producer=None):
+    """Publish an action task. Blocks on the broker, so call it via a thread."""
+    from .queue import execute_action  # Celery is only needed once something fires
+
+    return execute_action.apply_async(
+        args=[
+            ta.json_payload(),
+            ctx.model_dump(mode="json"),
+        ],
+        queue='triggered',
+        producer=producer,
+    )
+
+
+def _send_batch_to_celery(batch: List[tuple]) -> List:
+    """Publish action tasks for a batch of events over one broker connection.
+
+    Returns the task, or the exception raised while sending it, for each event.
+    """
+    from .queue import app as celery_app
+
+    results = []
+    with celery_app.producer_or_acquire() as producer:
+        for ta, ctx in batch:
+            try:
+                results.append(_send_to_celery(ta, ctx, producer))
+            except Exception as exc:  # noqa: WPS420
+                results.append(exc)
+    return results
+
+
+# Webhook triggers by mounted route path, served by the shared handler below
+_webhook_triggers: Dict[str, Trigger] = {}
+
+
+async def _webhook_handler(request: StarletteRequest) -> Response:
+    # Webhook routes are mounted as plain Starlette routes: the handler reads
+    # the raw request itself, so FastAPI's dependency analysis and OpenAPI
+    # schema are never needed
+    webhook_trigger = _webhook_triggers.get(request.url.path)
+    if webhook_trigger is None:
+        # The trigger-action behind this route was removed; Starlette routes
+        # stay mounted, so answer as if the path did not exist
+        return Response(
+            content=orjson.dumps({"error": "Webhook not found"}),
+            status_code=404,
+            media_type="application/json"
+        )
+    verify = getattr(webhook_trigger, "verify", None)
+    if verify is not None and not verify(request.headers.get("x-auth-key", "")):
+        return Response(
+            content=orjson.dumps({"error": "Invalid auth key"}),
+            status_code=403,
+            media_type="application/json"
+        )
+    try:
+        # Get the request body
+        body = orjson.loads(await request.body())
+        headers = dict(request.headers)
+        # Remove any non-serializable headers
+        headers = {k: v for k, v in headers.items() if isinstance(v, (str, int, float, bool))}
+
+        # Create payload
+        payload = {
+            "body": body,
+            "headers": headers
+        }
+
+        # Enqueue the payload using the trigger mounted on this path
+        try:
+            await webhook_trigger.enqueue(payload)
+        except asyncio.QueueFull:
+            logger.warning("Webhook queue full for %s, rejecting request", request.url.path)
+            return Response(
+                content=orjson.dumps({"error": "Webhook queue full"}),
+                status_code=503,
+                headers={"Retry-After": "1"},
+                media_type="application/json"
+            )
+
+        return Response(
+            content=orjson.dumps({"status": "queued"}),
+            media_type="application/json"
+        )
+    except Exception as e:
+        logger.error(f"Error handling webhook request: {str(e)}", exc_info=True)
+        return Response(
+            content=orjson.dumps({"error": str(e)}),
+            status_code=500,
+            media_type="application/json"
+        )
 
 
 class RuntimeManager:
     def __init__(self):
-        self.trigger_actions: List[TriggerAction] = []
+        TRIGGER_ACTIONS_DIR.mkdir(parents=True, exist_ok=True)
+        # Loaded trigger-actions by id, in load order
+        self.trigger_actions: Dict[str, TriggerAction] = {}
         self._watcher_tasks: List[asyncio.Task] = []
-        self._queue: asyncio.Queue = asyncio.Queue()
+        # Running (trigger, watcher task) by trigger-action id, so a removed or
+        # replaced trigger-action can be stopped
+        self._watchers: Dict[str, tuple] = {}
+        # Bounded so a stalled broker applies backpressure to the watchers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAX)
+        self._mounted_paths: Optional[set] = None
+        # Set once start() has finished, successfully or not; a failure is
+        # kept in _start_error so gated requests can fail fast
+        self._ready = asyncio.Event()
+        self._start_task: Optional[asyncio.Task] = None
+        self._start_error: Optional[BaseException] = None
 
     async def start(self):
-        self._load_from_disk()
+        await self._load_from_disk()
         await self._spawn_watchers()
         asyncio.create_task(self._dispatcher())
+        self._ready.set()
 
-    def _load_from_disk(self):
-        # First check TRIGGER_ACTIONS_DIR
-        for file in TRIGGER_ACTIONS_DIR.glob("*.json"):
-            try:
-                data = json.loads(file.read_text())
-                # type: ignore[attr-defined]
-                ta = TriggerAction.model_validate(
-                    data,
-                )
-                ta.filename = file.name  # Store the filename
-                self.trigger_actions.append(ta)
-            except Exception as exc:  # noqa: WPS420
-                logger.error("Failed to load trigger file %s: %s", file, exc)
-
+    async def _load_from_disk(self):
+        started = time.perf_counter()
+        trigger_files = list(TRIGGER_ACTIONS_DIR.glob("*.json"))
         # Then check EXAMPLES_DIR for any files not already loaded
         EXAMPLES_DIR = Path(os.getenv("TRIGGERED_EXAMPLES_PATH", "example_trigger_actions"))
-        if EXAMPLES_DIR.exists():
-            for file in EXAMPLES_DIR.glob("*.json"):
-                try:
-                    data = json.loads(file.read_text())
-                    # type: ignore[attr-defined]
-                    ta = TriggerAction.model_validate(
-                        data,
-                    )
-                    # Only add if not already loaded from TRIGGER_ACTIONS_DIR
-                    if not any(existing.id == ta.id for existing in self.trigger_actions):
-                        ta.filename = file.name  # Store the filename
-                        self.trigger_actions.append(ta)
-                except Exception as exc:  # noqa: WPS420
-                    logger.error("Failed to load example file %s: %s", file, exc)
+        example_files = list(EXAMPLES_DIR.glob("*.json"))  # Empty if the directory is missing
+
+        # Read and parse all files concurrently in worker threads, then merge in order
+        files = trigger_files + example_files
+        # Bound the reads in flight so huge directories don't exhaust file descriptors
+        sem = asyncio.Semaphore(32)
+
+        async def read(path: Path):
+            async with sem:
+                return await asyncio.to_thread(_read_trigger_file, path)
+
+        results = await asyncio.gather(*(read(file) for file in files))
+
+        for i, (file, result) in enumerate(zip(files, results)):
+            is_example = i >= len(trigger_files)
+            if isinstance(result, Exception):
+                kind = "example" if is_example else "trigger"
+                logger.error("Failed to load %s file %s: %s", kind, file, result)
+                continue
+            # Examples only fill in ids not already loaded from TRIGGER_ACTIONS_DIR
+            if result.id in self.trigger_actions:
+                if not is_example:
+                    logger.warning("Skipping %s: duplicate trigger-action id %s", file, result.id)
+                continue
+            result.filename = file.name  # Store the filename
+            result.json_payload()  # Serialize once up front rather than on first fire
+            self.trigger_actions[result.id] = result
+
+        logger.info(
+            "Loaded %d trigger-actions from %d files in %.3fs",
+            len(self.trigger_actions), len(files), time.perf_counter() - started,
+        )
+
+    def _start_watcher(self, ta: TriggerAction):
+        """Instantiate the trigger for ``ta`` and start watching it.
+
+        The trigger class comes from the memoized registry lookup; instances
+        are not shared because triggers keep per-watcher state.
+        """
+        trigger = get_trigger(ta.trigger.type)(ta.trigger.config)
+        task = asyncio.create_task(
+            trigger.watch(
+                lambda ctx, ta=ta: self._queue.put((ta, ctx)),
+            ),
+        )
+        self._watcher_tasks.append(task)
+        self._watchers[ta.id] = (trigger, task)
+
+        if hasattr(trigger, "route") and hasattr(trigger, "enqueue"):
+            self._mount_webhook(trigger)
+        return trigger
 
     async def _spawn_watchers(self):
-        for ta in self.trigger_actions:
-            trigger_cls = get_trigger(ta.trigger.type)
-            trigger = trigger_cls(ta.trigger.config)
-            task = asyncio.create_task(
-                trigger.watch(
-                    lambda ctx, ta=ta: self._queue.put((ta, ctx)),
-                ),
-            )
-            self._watcher_tasks.append(task)
-
-            # Dynamically mount FastAPI route for webhook triggers
-            if hasattr(trigger, "route") and hasattr(trigger, "enqueue"):
-                route_path = getattr(trigger, "route")
-
-                # Avoid re-registering the same path
-                existing_paths = {r.path for r in app.router.routes}
-                if route_path not in existing_paths:
-                    # Create a closure to capture the trigger instance
-                    webhook_trigger = trigger  # Capture the trigger instance
-
-                    class WebhookRoute(APIRoute):
-                        def get_route_handler(self):
-                            async def handler(request: StarletteRequest) -> Response:
-                                try:
-                                    # Get the request body
-                                    body = await request.json()
-                                    headers = dict(request.headers)
-                                    # Remove any non-serializable headers
-                                    headers = {k: v for k, v in headers.items() if isinstance(v, (str, int, float, bool))}
-                                    
-                                    # Create payload
-                                    payload = {
-                                        "body": body,
-                                        "headers": headers
-                                    }
-                                    
-                                    # Enqueue the payload using the captured webhook trigger
-                                    await webhook_trigger.enqueue(payload)
-                                    
-                                    return Response(
-                                        content=json.dumps({"status": "queued"}),
-                                        media_type="application/json"
-                                    )
-                                except Exception as e:
-                                    logger.error(f"Error handling webhook request: {str(e)}", exc_info=True)
-                                    return Response(
-                                        content=json.dumps({"error": str(e)}),
-                                        status_code=500,
-                                        media_type="application/json"
-                                    )
-                            return handler
-
-                    # Create a route with the custom route class
-                    route = WebhookRoute(
-                        path=route_path,
-                        endpoint=lambda: None,  # Dummy endpoint
-                        methods=["POST"]
-                    )
-                    app.router.routes.append(route)
+        for ta in self.trigger_actions.values():
+            self._start_watcher(ta)
+
+    def _mount_webhook(self, trigger):
+        """Dynamically mount the shared webhook handler on the trigger's route."""
+        route_path = getattr(trigger, "route")
+        # A replaced trigger takes over the path even when it is already mounted
+        _webhook_triggers[route_path] = trigger
+
+        # Avoid re-registering the same path; seeded once from the app's routes
+        if self._mounted_paths is None:
+            self._mounted_paths = {r.path for r in app.router.routes}
+        if route_path in self._mounted_paths:
+            return
+        self._mounted_paths.add(route_path)
+        app.router.routes.append(Route(route_path, endpoint=_webhook_handler, methods=["POST"]))
 
     async def _dispatcher(self):
         while True:
-            ta, ctx = await self._queue.get()
-            RECENT_EVENTS.append(
-                {
-                    "id": ta.id,
-                    "time": ctx.fired_at.isoformat(),
-                },
-            )
-            # Log that we're dispatching the action
-            logger.info(f"Dispatching action for trigger-action {ta.filename or ta.id}")
+            batch = [await self._queue.get()]
+            # Coalesce events arriving within the dispatch window so a burst is sent together
+            deadline = asyncio.get_running_loop().time() + DISPATCH_WINDOW
+            while len(batch) < DISPATCH_BATCH_SIZE:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            if DISPATCH_DEDUP:
+                batch = _dedup_batch(batch)
+
+            RECENT_EVENTS.extend(Event(ta.id, ctx.fired_at_iso) for ta, ctx in batch)
+            for ta, _ in batch:
+                # Log that we're dispatching the action
+                logger.info(f"Dispatching action for trigger-action {ta.filename or ta.id}")
             
             # Execute the action based on the execution mode
             if START_WORKER:
                 # Use Celery for task execution
                 try:
-                    task = execute_action.apply_async(
-                        args=[
-                            ta.model_dump(mode="json"),
-                            ctx.model_dump(mode="json"),
-                        ],
-                        queue='triggered'
-                    )
-                    logger.debug(f"Action task scheduled with ID: {task.id}")
+                    results = await asyncio.to_thread(_send_batch_to_celery, batch)
                 except Exception as e:
-                    logger.error(f"Failed to schedule action task: {str(e)}", exc_info=True)
+                    logger.error(f"Failed to schedule action tasks: {str(e)}", exc_info=True)
+                    continue
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Failed to schedule action task: {str(result)}", exc_info=result)
+                    else:
+                        logger.debug(f"Action task scheduled with ID: {result.id}")
             else:
-                # Execute action directly in the same process
-                try:
-                    result = await ta.execute_action(ctx)
-                    logger.debug(f"Action executed successfully: {result}")
-                except Exception as e:
-                    logger.error(f"Failed to execute action: {str(e)}", exc_info=True)
-
-    def add_trigger_action(self, ta: TriggerAction):
+                # Execute actions directly in the same process
+                for ta, ctx in batch:
+                    try:
+                        result = await ta.execute_action(ctx)
+                        logger.debug(f"Action executed successfully: {result}")
+                    except Exception as e:
+                        logger.error(f"Failed to execute action: {str(e)}", exc_info=True)
+
+    async def add_trigger_action(self, ta: TriggerAction):
         file_path = TRIGGER_ACTIONS_DIR / f"{ta.id}.json"
-        file_path.write_text(
-            json.dumps(
-                ta.model_dump(mode="json"),
-                indent=2,
-            ),
-        )
         ta.filename = file_path.name  # Store the filename
-        self.trigger_actions.append(ta)
+        # The cached payload is written to disk and reused by every dispatch.
+        # Persist first so a failed write leaves nothing to roll back.
+        await asyncio.to_thread(_write_trigger_file, file_path, ta.json_payload())
+        self.trigger_actions[ta.id] = ta
         # Start watcher for this trigger
-        trigger_cls = get_trigger(ta.trigger.type)
-        trigger = trigger_cls(ta.trigger.config)
-        task = asyncio.create_task(
-            trigger.watch(
-                lambda ctx, ta=ta: self._queue.put((ta, ctx)),
-            ),
-        )
-        self._watcher_tasks.append(task)
+        self._start_watcher(ta)
+
+    def get_trigger_action(self, trigger_id: str) -> Optional[TriggerAction]:
+        return self.trigger_actions.get(trigger_id)
+
+    def _stop_watcher(self, trigger_id: str):
+        """Cancel the watcher of a trigger-action and unmount its webhook."""
+        watcher = self._watchers.pop(trigger_id, None)
+        if watcher is None:
+            return
+        trigger, task = watcher
+        task.cancel()
+        if task in self._watcher_tasks:
+            self._watcher_tasks.remove(task)
+        route_path = getattr(trigger, "route", None)
+        # Only drop the route if it still points at this trigger's queue
+        if route_path is not None and _webhook_triggers.get(route_path) is trigger:
+            del _webhook_triggers[route_path]
+
+    def remove_trigger_action(self, ta: TriggerAction):
+        self._stop_watcher(ta.id)
+        self.trigger_actions.pop(ta.id, None)
+
+    def replace_trigger_action(self, ta: TriggerAction):
+        self._stop_watcher(ta.id)
+        self.trigger_actions[ta.id] = ta
+        self._start_watcher(ta)
 
 
 runtime = RuntimeManager()
 
 
+@app.middleware("http")
+async def wait_until_ready(request: Request, call_next):
+    """Hold requests until the runtime has started, except for health checks."""
+    if request.url.path not in UNGATED_PATHS:
+        if not runtime._ready.is_set():
+            try:
+                await asyncio.wait_for(runtime._ready.wait(), timeout=STARTUP_TIMEOUT)
+            except asyncio.TimeoutError:
+                return ORJSONResponse({"detail": "Runtime is starting"}, status_code=503)
+        if runtime._start_error is not None:
+            return ORJSONResponse({"detail": "Runtime failed to start"}, status_code=503)
+    return await call_next(request)
+
+
+def _get_authorized(trigger_id: str, auth: str) -> TriggerAction:
+    """Look up a trigger-action by ID and check its auth key."""
+    ta = runtime.get_trigger_action(trigger_id)
+    if ta is None:
+        raise HTTPException(status_code=404, detail="Trigger not found")
+    if ta.auth_key != auth:
+        raise HTTPException(status_code=403, detail="Invalid auth key")
+    return ta
+
+
 def check_sqlite_connection():
-    """Check if SQLite database is accessible."""
+    """Check if SQLite database is accessible.
+
+    By default this only checks that the data directory is writable; set
+    TRIGGERED_STRICT_SQLITE_CHECK=1 to open a throwaway database as well.
+    """
     try:
         data_dir = Path(os.getenv("TRIGGERED_DATA_DIR", "data"))
         data_dir.mkdir(parents=True, exist_ok=True)
+
+        if not os.getenv("TRIGGERED_STRICT_SQLITE_CHECK"):
+            if not os.access(data_dir, os.W_OK):
+                logger.warning("Data directory %s is not writable", data_dir)
+                return False
+            return True
         
         # Try to create a test connection
         import sqlite3
@@ -247,9 +474,18 @@ def check_sqlite_connection():
         return False
 
 
-def start_celery_worker():
+async def _forward_output(stream: asyncio.StreamReader):
+    """Log each line the worker writes to ``stream`` until it closes."""
+    async for line in stream:
+        text = line.decode(errors="replace").rstrip()
+        if text:  # Only log non-empty messages
+            logger.info("[celery] %s", text)
+
+
+async def start_celery_worker():
     """Start the Celery worker in a separate process."""
     global worker_process
+    from .queue import MAX_TASKS_PER_CHILD
     
     # Check SQLite connection
     if not check_sqlite_connection():
@@ -286,62 +522,41 @@ def start_celery_worker():
         "--without-mingle",  # Disable mingle for single worker
         "--without-heartbeat",  # Disable heartbeat for single worker
         "--events",  # Enable events for monitoring
-        "--max-tasks-per-child=1",  # Restart worker after each task
+        f"--max-tasks-per-child={MAX_TASKS_PER_CHILD}",  # Amortize worker startup over many tasks
         "--prefetch-multiplier=1",  # Process one task at a time
         "--max-memory-per-child=512000"  # Restart worker if memory exceeds 512MB
     ]
     
-    # Start the worker process
-    worker_process = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=1,
-        universal_newlines=True,
+    # Start the worker process; its log output arrives on stderr
+    worker_process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
         env=env,
         cwd=parent_dir  # Set working directory to parent directory
     )
-    
-    # Start threads to forward worker output
-    def forward_output(pipe, prefix):
-        import re
-        # Pattern to match any of:
-        # 1. Timestamp and log level: [DD/MM/YY HH:MM:SS] INFO
-        # 2. Just log level: INFO
-        # 3. Celery format: [YYYY-MM-DD HH:MM:SS,SSS: INFO/MainProcess]
-        #log_pattern = re.compile(r'^\s*(?:\[\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}\]\s+|\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2},\d{3}:\s+\w+/\w+\]\s+)?\w+\s+')
-        
-        for line in pipe:
-            # Strip timestamp and log level if present
-            #message = log_pattern.sub('', line.strip())
-            if line:  # Only log non-empty messages
-                logger.info(f"[celery] {line}")
-    
-    import threading
-    #threading.Thread(target=forward_output, args=(worker_process.stdout, "OUT"), daemon=True).start()
-    threading.Thread(target=forward_output, args=(worker_process.stderr, "ERR"), daemon=True).start()
+    _worker_output_tasks.append(asyncio.create_task(_forward_output(worker_process.stderr)))
     
     # Wait a bit to check if worker started successfully
     try:
         # Check if process is still running after a short delay
-        time.sleep(2)
-        if worker_process.poll() is not None:
-            # Process has terminated, get the error output
-            _, stderr = worker_process.communicate()
-            raise RuntimeError(f"Celery worker failed to start: {stderr}")
+        await asyncio.sleep(2)
+        if worker_process.returncode is not None:
+            # Process has terminated; its output has already been logged
+            raise RuntimeError(f"Celery worker failed to start (exit code {worker_process.returncode})")
         
         logger.info("Celery worker started successfully")
         return worker_process
     except Exception as e:
         logger.error(f"Failed to start Celery worker: {str(e)}")
         if worker_process:
-            worker_process.terminate()
+            if worker_process.returncode is None:
+                worker_process.terminate()
             worker_process = None
         raise
 
 
-def stop_celery_worker():
+async def stop_celery_worker():
     """Stop the Celery worker process."""
     global worker_process
     if worker_process is not None:
@@ -351,12 +566,15 @@ def stop_celery_worker():
             worker_process.terminate()
             try:
                 # Wait for the process to terminate
-                worker_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
+                await asyncio.wait_for(worker_process.wait(), timeout=5)
+            except asyncio.TimeoutError:
                 # If it doesn't terminate, force kill it
                 logger.warning("Worker process did not terminate gracefully, forcing kill...")
                 worker_process.kill()
-                worker_process.wait()
+                await worker_process.wait()
+            # The output pipes close with the process, ending the forwarders
+            await asyncio.gather(*_worker_output_tasks, return_exceptions=True)
+            _worker_output_tasks.clear()
         except Exception as e:
             logger.error(f"Error stopping Celery worker: {str(e)}")
         finally:
@@ -364,12 +582,11 @@ def stop_celery_worker():
             logger.info("Celery worker stopped")
 
 
-@app.on_event("startup")
 async def on_startup():
     # Start the Celery worker if enabled
     if START_WORKER:
         try:
-            worker_process = start_celery_worker()
+            await start_celery_worker()
             logger.info("Started Celery worker")
         except Exception as e:
             logger.error(f"Failed to start Celery worker: {str(e)}")
@@ -377,106 +594,89 @@ async def on_startup():
     else:
         logger.info("Celery worker disabled - assuming it's running externally")
     
-    # Start the runtime manager
-    await runtime.start()
-    logger.info("Started runtime manager")
+    # Start the runtime manager in the background so the server accepts
+    # connections right away; other endpoints wait for it to become ready
+    runtime._start_task = asyncio.create_task(runtime.start())
+    runtime._start_task.add_done_callback(_log_start_result)
+
+
+def _log_start_result(task: asyncio.Task):
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logger.error("Failed to start runtime manager: %s", task.exception())
+        # Release requests waiting for startup; the middleware answers 503
+        runtime._start_error = task.exception()
+        runtime._ready.set()
+    else:
+        logger.info("Started runtime manager")
 
 
 @app.post("/trigger_actions")
 async def create_trigger(req: Request):
-    body = await req.json()
     try:
-        # type: ignore[attr-defined]
-        ta = TriggerAction.model_validate(
-            body,
+        ta = TriggerAction.model_validate_json(
+            await req.body(),
         )
     except Exception as exc:  # noqa: WPS420
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return ORJSONResponse({"detail": str(exc)}, status_code=400)
 
-    runtime.add_trigger_action(ta)
-    return {"id": ta.id, "auth_key": ta.auth_key}
+    await runtime.add_trigger_action(ta)
+    return ORJSONResponse({"id": ta.id, "auth_key": ta.auth_key})
 
 
 @app.get("/trigger_actions/{trigger_id}")
 async def get_trigger_info(trigger_id: str, auth: str):
-    for ta in runtime.trigger_actions:
-        if ta.id == trigger_id:
-            if ta.auth_key != auth:
-                raise HTTPException(status_code=403, detail="Invalid auth key")
-            return ta.model_dump()
-    raise HTTPException(status_code=404, detail="Trigger not found")
+    return _get_authorized(trigger_id, auth).json_payload()
 
 
 @app.get("/trigger_actions")
 async def list_triggers():
     """List all registered triggers."""
-    return [ta.model_dump() for ta in runtime.trigger_actions]
+    return [ta.json_payload() for ta in runtime.trigger_actions.values()]
 
 
 @app.delete("/trigger_actions/{trigger_id}")
 async def delete_trigger(trigger_id: str, auth: str):
     """Delete a trigger by ID."""
-    for i, ta in enumerate(runtime.trigger_actions):
-        if ta.id == trigger_id:
-            if ta.auth_key != auth:
-                raise HTTPException(status_code=403, detail="Invalid auth key")
-            
-            # Remove the trigger file if it exists
-            if ta.filename:
-                file_path = TRIGGER_ACTIONS_DIR / ta.filename
-                if file_path.exists():
-                    file_path.unlink()
-            
-            # Remove from runtime
-            runtime.trigger_actions.pop(i)
-            return {"status": "deleted"}
-    
-    raise HTTPException(status_code=404, detail="Trigger not found")
+    ta = _get_authorized(trigger_id, auth)
+
+    # Remove the trigger file if it exists
+    if ta.filename:
+        try:
+            (TRIGGER_ACTIONS_DIR / ta.filename).unlink()
+        except FileNotFoundError:
+            pass
+
+    # Remove from runtime
+    runtime.remove_trigger_action(ta)
+    return {"status": "deleted"}
 
 
 @app.put("/trigger_actions/{trigger_id}")
 async def update_trigger(trigger_id: str, auth: str, req: Request):
     """Update an existing trigger."""
-    # First find the existing trigger
-    existing_ta = None
-    for ta in runtime.trigger_actions:
-        if ta.id == trigger_id:
-            if ta.auth_key != auth:
-                raise HTTPException(status_code=403, detail="Invalid auth key")
-            existing_ta = ta
-            break
-    
-    if not existing_ta:
-        raise HTTPException(status_code=404, detail="Trigger not found")
+    # First check the trigger exists and the auth key matches
+    _get_authorized(trigger_id, auth)
     
     # Get the new configuration
-    body = await req.json()
     try:
-        # type: ignore[attr-defined]
-        new_ta = TriggerAction.model_validate(body)
+        new_ta = TriggerAction.model_validate_json(await req.body())
     except Exception as exc:  # noqa: WPS420
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return ORJSONResponse({"detail": str(exc)}, status_code=400)
     
     # Ensure the ID matches
     if new_ta.id != trigger_id:
-        raise HTTPException(status_code=400, detail="Trigger ID mismatch")
+        return ORJSONResponse({"detail": "Trigger ID mismatch"}, status_code=400)
     
     # Update the file
     file_path = TRIGGER_ACTIONS_DIR / f"{new_ta.id}.json"
-    file_path.write_text(
-        json.dumps(
-            new_ta.model_dump(mode="json"),
-            indent=2,
-        ),
-    )
+    await asyncio.to_thread(_write_trigger_file, file_path, new_ta.json_payload())
     
     # Update in runtime
-    for i, ta in enumerate(runtime.trigger_actions):
-        if ta.id == trigger_id:
-            runtime.trigger_actions[i] = new_ta
-            break
+    runtime.replace_trigger_action(new_ta)
     
-    return new_ta.model_dump()
+    return ORJSONResponse(new_ta.json_payload())
 
 
 @app.get("/events")
@@ -486,9 +686,10 @@ async def list_events(limit: int = 50):
     Args:
         limit: Maximum number of events to return (default: 50)
     """
+    total = len(RECENT_EVENTS)
     return {
-        "events": RECENT_EVENTS[-limit:],
-        "total": len(RECENT_EVENTS),
+        "events": [e._asdict() for e in islice(RECENT_EVENTS, max(0, total - limit), None)],
+        "total": total,
         "limit": limit
     }
 
@@ -501,15 +702,16 @@ async def get_status():
         "version": "1.0.0",  # TODO: Get from package version
         "uptime": "0:00:00",  # TODO: Calculate from startup time
         "worker": {
-            "status": "running" if worker_process and worker_process.poll() is None else "stopped",
+            "status": "running" if worker_process and worker_process.returncode is None else "stopped",
             "pid": worker_process.pid if worker_process else None
         },
         "triggers": {
             "total": len(runtime.trigger_actions),
-            "active": len([ta for ta in runtime.trigger_actions if any(not t.done() for t in runtime._watcher_tasks)])
+            "active": len([ta for ta in runtime.trigger_actions.values() if any(not t.done() for t in runtime._watcher_tasks)])
         },
         "queue": {
-            "size": runtime._queue.qsize() if hasattr(runtime, "_queue") else 0
+            "size": runtime._queue.qsize() if hasattr(runtime, "_queue") else 0,
+            "maxsize": runtime._queue.maxsize if hasattr(runtime, "_queue") else 0
         }
     }
 
@@ -521,20 +723,10 @@ async def run_trigger(trigger_id: str, auth: str):
     This will execute the trigger's action immediately, bypassing the normal trigger conditions.
     """
     # Find the trigger
-    trigger_ta = None
-    for ta in runtime.trigger_actions:
-        if ta.id == trigger_id:
-            if ta.auth_key != auth:
-                raise HTTPException(status_code=403, detail="Invalid auth key")
-            trigger_ta = ta
-            break
-    
-    if not trigger_ta:
-        raise HTTPException(status_code=404, detail="Trigger not found")
+    trigger_ta = _get_authorized(trigger_id, auth)
     
     # Create a context for manual execution
     from datetime import datetime
-    from .core import TriggerContext
     
     ctx = TriggerContext(
         fired_at=datetime.utcnow(),
@@ -546,34 +738,31 @@ async def run_trigger(trigger_id: str, auth: str):
     
     # Execute the action asynchronously
     try:
-        task = execute_action.apply_async(
-            args=[
-                trigger_ta.model_dump(mode="json"),
-                ctx.model_dump(mode="json"),
-            ],
-            queue='triggered'
-        )
+        task = await asyncio.to_thread(_send_to_celery, trigger_ta, ctx)
         logger.info(f"Manual trigger execution scheduled with task ID: {task.id}")
         
         return {
             "status": "scheduled",
             "task_id": task.id,
             "trigger_id": trigger_id,
-            "timestamp": ctx.fired_at.isoformat()
+            "timestamp": ctx.fired_at_iso
         }
     except Exception as e:
         logger.error(f"Failed to schedule manual trigger execution: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to execute trigger: {str(e)}")
 
 
-@app.on_event("shutdown")
 async def on_shutdown():
     # Stop the Celery worker if we started it
     if START_WORKER:
-        stop_celery_worker()
+        await stop_celery_worker()
     
     # Stop the runtime manager
+    if runtime._start_task is not None:
+        runtime._start_task.cancel()
     for task in runtime._watcher_tasks:
         task.cancel()
     await asyncio.gather(*runtime._watcher_tasks, return_exceptions=True)
+    from .actions.webhook_call import aclose_client
+    await aclose_client()
     logger.info("Runtime manager stopped") 
\ No newline at end of file
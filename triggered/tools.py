@@ -1,11 +1,8 @@
 from typing import Dict, Type, Any, Optional, Union
-import datetime as _dt
 from pydantic import BaseModel, Field
-import httpx
+import copy
 import os
 import importlib.util
-import inspect
-import logging
 import random
 
 from .logging_config import logger
@@ -31,6 +28,27 @@ class Tool:
     def __init__(self):
         pass
 
+    @classmethod
+    def get_function_schema(cls) -> Dict[str, Any]:
+        """Return the function-calling spec for this tool.
+
+        The spec only depends on the class, so it is built once and stored on
+        the class instead of regenerating the JSON schema on every model call.
+        Callers get a copy, so the stored spec can't be modified through them.
+        """
+        schema = cls.__dict__.get("_function_schema")
+        if schema is None:
+            schema = {
+                "type": "function",
+                "function": {
+                    "name": cls.name,
+                    "description": cls.description,
+                    "parameters": cls.args_schema.model_json_schema(),
+                },
+            }
+            cls._function_schema = schema
+        return copy.deepcopy(schema)
+
     async def _call(self, **kwargs) -> Any:
         raise NotImplementedError
 
@@ -51,6 +69,21 @@ TOOL_REGISTRY: Dict[str, Type[Tool]] = {
 }
 
 
+# Tools are stateless, so a single instance per type is shared by all callers
+_TOOL_INSTANCES: Dict[str, Tool] = {}
+
+
+def get_tool_instance(tool_type: str) -> Tool:
+    """Return the shared instance of a registered tool type."""
+    tool_cls = TOOL_REGISTRY[tool_type]
+    instance = _TOOL_INSTANCES.get(tool_type)
+    # Re-create the instance if the type was re-registered with another class
+    if instance is None or type(instance) is not tool_cls:
+        instance = tool_cls()
+        _TOOL_INSTANCES[tool_type] = instance
+    return instance
+
+
 def get_tools(tool_configs: list[Union[str, Dict[str, Any]]]) -> Dict[str, Tool]:
     """Get tool instances from configurations.
     
@@ -61,23 +94,30 @@ def get_tools(tool_configs: list[Union[str, Dict[str, Any]]]) -> Dict[str, Tool]
     """
     tools = {}
     for config in tool_configs:
-        if isinstance(config, str):
-            tool_type = config
-        else:
-            tool_type = config.get("type")
-            
-        if tool_type not in TOOL_REGISTRY:
+        tool_type = config if isinstance(config, str) else config.get("type")
+        # A single registry lookup; unknown types surface as KeyError
+        try:
+            tools[tool_type] = get_tool_instance(tool_type)
+        except KeyError:
             logger.warning("Unknown tool type: %s", tool_type)
-            continue
-            
-        tool_cls = TOOL_REGISTRY[tool_type]
-        tools[tool_type] = tool_cls()
     return tools
 
 
+# (mtime_ns, size) of each custom tools module at the time it was last executed
+_LOADED_TOOL_MODULES: Dict[str, tuple] = {}
+
+
 def load_tools_from_module(module_path: str) -> None:
-    """Load custom tools from a Python module."""
+    """Load custom tools from a Python module.
+
+    A module is only executed again when its file has changed since the last
+    load, so repeated calls for the same path are cheap.
+    """
     try:
+        st = os.stat(module_path)
+        signature = (st.st_mtime_ns, st.st_size)
+        if _LOADED_TOOL_MODULES.get(module_path) == signature:
+            return
         spec = importlib.util.spec_from_file_location("custom_tools", module_path)
         if spec is None or spec.loader is None:
             raise ImportError(f"Could not load module from {module_path}")
@@ -85,11 +125,11 @@ def load_tools_from_module(module_path: str) -> None:
         spec.loader.exec_module(module)
         
         # Look for Tool subclasses in the module
-        for name in dir(module):
-            obj = getattr(module, name)
-            if isinstance(obj, type) and issubclass(obj, Tool) and obj != Tool:
+        for obj in vars(module).values():
+            if isinstance(obj, type) and obj is not Tool and issubclass(obj, Tool):
                 TOOL_REGISTRY[obj.name] = obj
                 logger.info("Loaded custom tool: %s", obj.name)
+        _LOADED_TOOL_MODULES[module_path] = signature
     except Exception as e:
         logger.error("Failed to load custom tools from %s: %s", module_path, e)
         raise 
\ No newline at end of file
@@ -1,8 +1,11 @@
 import asyncio
 import json
 import logging
-import re
+import time
 from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
 from ..core import Trigger, TriggerContext
 from ..models import get_model
 from ..tools import get_tools, load_tools_from_module
@@ -11,6 +14,15 @@ from ..config_schema import ConfigSchema, ConfigField
 
 logger = logging.getLogger(__name__)
 
+# Non-strict so raw newlines inside strings, common in model output, still parse
+_JSON_DECODER = json.JSONDecoder(strict=False)
+
+# Decisions shared by AI triggers with an identical model, prompt and tool set,
+# as {key: (expires_at, decision)}; only used when cache_ttl is set
+_DECISION_CACHE: Dict[tuple, Tuple[float, Dict]] = {}
+
+GENERAL_INSTRUCTION = "You are the decision maker if to run the user action or not. You must return a JSON response with the following schema: { \"trigger\": <true|false>, \"reason\": \"<short explanation why you made the decision>\" }. Always response in this and only this format. Use the tools if provided and suitable to make the decision. Here is the user defined criteria for you to consider:"
+
 
 def extract_json_from_response(response: str) -> Tuple[Optional[Dict], Optional[str]]:
     """
@@ -19,23 +31,32 @@ def extract_json_from_response(response: str) -> Tuple[Optional[Dict], Optional[
     """
     try:
         # First try direct JSON parsing
-        return json.loads(response), None
-    except json.JSONDecodeError:
-        # Try to find JSON in markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*(\{[\s\S]*?\})\s*```', response)
-        if not json_match:
-            # If no markdown block found, try to find any JSON object
-            json_match = re.search(r'\{[\s\S]*?\}', response)
-        
-        if json_match:
+        return orjson.loads(response), None
+    except orjson.JSONDecodeError:
+        pass
+
+    # Prefer the contents of a markdown code block, then the whole response
+    candidates = []
+    fence = response.find("```")
+    if fence != -1:
+        end = response.find("```", fence + 3)
+        if end != -1:
+            candidates.append(response[fence + 3:end])
+    candidates.append(response)
+
+    found = False
+    for text in candidates:
+        start = text.find("{")
+        while start != -1:
+            found = True
             try:
-                json_str = json_match.group(1) if '```' in response else json_match.group(0)
-                # Clean up the string
-                json_str = re.sub(r'\s+', ' ', json_str)
-                return json.loads(json_str), None
-            except json.JSONDecodeError:
-                return None, f"Failed to parse extracted JSON: {response}"
-        return None, f"No valid JSON object found in response: {response}"
+                obj, _ = _JSON_DECODER.raw_decode(text, start)
+                return obj, None
+            except ValueError:
+                start = text.find("{", start + 1)
+    if found:
+        return None, f"Failed to parse extracted JSON: {response}"
+    return None, f"No valid JSON object found in response: {response}"
 
 
 @register_trigger("ai")
@@ -91,6 +112,13 @@ class AITrigger(Trigger):
                 type="string",
                 description="Path to custom tools module",
                 required=False
+            ),
+            ConfigField(
+                name="cache_ttl",
+                type="integer",
+                description="Seconds to reuse a model decision before asking again (0 disables)",
+                default=0,
+                required=False
             )
         ])
 
@@ -99,8 +127,17 @@ class AITrigger(Trigger):
         self.model = get_model(model=config.get("model"), api_base=config.get("api_base"))
         self.interval = config.get("interval", 60)
         self.prompt = config.get("prompt", "")
+        # The prompt never changes between checks, so build it once
+        self.full_prompt = f"{GENERAL_INSTRUCTION}\n\n{self.prompt}"
         self.tool_configs = config.get("tools", [])
         self.tools = get_tools(self.tool_configs)
+        self.cache_ttl = config.get("cache_ttl", 0)
+        self._cache_key = (
+            config.get("model"),
+            config.get("api_base"),
+            self.full_prompt,
+            orjson.dumps(self.tool_configs, option=orjson.OPT_SORT_KEYS),
+        )
         custom_tools_path = config.get("custom_tools_path")
         if custom_tools_path:
             load_tools_from_module(custom_tools_path)
@@ -108,9 +145,12 @@ class AITrigger(Trigger):
     async def check(self) -> Optional[TriggerContext]:
         """Check if the trigger condition is met."""
         try:
-            general_instruction = "You are the decision maker if to run the user action or not. You must return a JSON response with the following schema: { \"trigger\": <true|false>, \"reason\": \"<short explanation why you made the decision>\" }. Always response in this and only this format. Use the tools if provided and suitable to make the decision. Here is the user defined criteria for you to consider:"
-            full_prompt = f"{general_instruction}\n\n{self.prompt}"
-            response = await self.model.ainvoke(full_prompt, tools=self.tool_configs)
+            if self.cache_ttl:
+                cached = _DECISION_CACHE.get(self._cache_key)
+                if cached is not None and cached[0] > time.monotonic():
+                    return TriggerContext(trigger_name=self.name, data=dict(cached[1]))
+
+            response = await self.model.ainvoke(self.full_prompt, tools=self.tool_configs, expect_json=True)
             
             obj, error = extract_json_from_response(response)
             if error:
@@ -119,9 +159,17 @@ class AITrigger(Trigger):
                 
             if not isinstance(obj, dict) or "trigger" not in obj:
                 error_msg = "Model response is not a valid JSON or missing 'trigger' field"
-                logger.error(f"{error_msg}: {response}")
+                logger.error("%s: %s", error_msg, response)
                 return TriggerContext(trigger_name=self.name, data={"trigger": False, "reason": error_msg})
                 
+            if self.cache_ttl:
+                now = time.monotonic()
+                # Drop expired decisions so triggers that were removed or
+                # reconfigured don't leave entries behind
+                for key in [k for k, (expires, _) in _DECISION_CACHE.items() if expires <= now]:
+                    del _DECISION_CACHE[key]
+                _DECISION_CACHE[self._cache_key] = (now + self.cache_ttl, obj)
+
             # Always return a context, even when not triggered
             return TriggerContext(trigger_name=self.name, data=obj)
                 
@@ -132,6 +180,10 @@ class AITrigger(Trigger):
 
     async def watch(self, queue_put) -> None:
         """Watch for trigger conditions."""
+        loop = asyncio.get_running_loop()
+        # Ticks are scheduled against a monotonic deadline so the time spent
+        # in check() does not push every following tick later
+        deadline = loop.time()
         while True:
             try:
                 ctx = await self.check()
@@ -141,7 +193,13 @@ class AITrigger(Trigger):
                     if triggered:
                         await queue_put(ctx)
                     else:
-                        logger.info(f"Trigger {self.name} not fired: {reason}")
+                        logger.info("Trigger %s not fired: %s", self.name, reason)
             except Exception as e:
                 logger.error("Error in AI trigger watch loop: %s", str(e))
-            await asyncio.sleep(self.interval) 
\ No newline at end of file
+            deadline += self.interval
+            now = loop.time()
+            if deadline < now:
+                # check() overran the interval; start a fresh interval from now
+                # so a slow model is never polled back to back
+                deadline = now + self.interval
+            await asyncio.sleep(deadline - now) 
\ No newline at end of file
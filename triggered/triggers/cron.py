@@ -1,5 +1,6 @@
 import asyncio
 import datetime as _dt
+import time
 from typing import Dict, Any
 import zoneinfo
 import logging
@@ -11,6 +12,7 @@ from ..config_schema import ConfigSchema, ConfigField
 
 logger = logging.getLogger(__name__)
 
+
 @register_trigger("cron")
 class CronTrigger(Trigger):
     """Trigger that fires according to a crontab expression.
@@ -57,12 +59,18 @@ class CronTrigger(Trigger):
         self._iter = croniter(self.expr, _dt.datetime.now(self.timezone))
 
     async def watch(self, queue_put):
+        loop = asyncio.get_running_loop()
+        # Fire times come from croniter as UTC timestamps, which already account
+        # for DST in the configured timezone; the wall clock is read once to map
+        # them onto the loop's monotonic clock
+        offset = loop.time() - time.time()
         while True:
-            now = _dt.datetime.now(self.timezone)
-            next_time = self._iter.get_next(_dt.datetime)
-            delay = (next_time - now).total_seconds()
-            logger.info(f"Crontab - next running time: now: {now} next: {next_time}, delay: {delay}")
+            deadline = self._iter.get_next(float) + offset
+            delay = deadline - loop.time()
+            if logger.isEnabledFor(logging.INFO):
+                next_time = _dt.datetime.fromtimestamp(deadline - offset, self.timezone)
+                logger.info("Crontab - next running time: %s, delay: %.3f", next_time, delay)
             if delay > 0:
                 await asyncio.sleep(delay)
             ctx = TriggerContext(trigger_name=self.name)
-            await queue_put(ctx) 
\ No newline at end of file
+            await queue_put(ctx)
@@ -1,5 +1,7 @@
 import asyncio
+import fnmatch
 import os
+import re
 from pathlib import Path
 from typing import Dict, Any
 
@@ -7,11 +9,24 @@ from ..core import Trigger, TriggerContext
 from ..registry import register_trigger
 from ..config_schema import ConfigSchema, ConfigField
 
+try:
+    from watchfiles import Change, awatch
+    _CHANGE_EVENTS = {
+        Change.added: "created",
+        Change.modified: "modified",
+        Change.deleted: "deleted",
+    }
+except ImportError:  # pragma: no cover - watchfiles ships with uvicorn[standard]
+    awatch = None
+
 
 @register_trigger("folder-monitor")
 class FolderMonitorTrigger(Trigger):
     """Trigger that fires whenever a file changes in the specified folder.
 
+    Changes are delivered by the OS file notification API through watchfiles
+    when it is installed; otherwise the folder is polled every ``interval``.
+
     Config keys:
     - path: str, directory to watch
     - interval: int, polling interval (seconds, default 5)
@@ -70,24 +85,91 @@ class FolderMonitorTrigger(Trigger):
         self.patterns = config.get("patterns", ["*"])
         self.events = config.get("events", ["created", "modified", "deleted"])
         self.recursive = config.get("recursive", False)
-        self._snapshot = self._hash_dir()
+        # Plain name patterns are folded into one compiled regex; patterns with a
+        # directory part keep Path.match semantics
+        name_patterns = [p for p in self.patterns if "/" not in p and os.sep not in p]
+        self._path_patterns = [p for p in self.patterns if p not in name_patterns]
+        self._name_re = re.compile(
+            "|".join(f"(?:{fnmatch.translate(p)})" for p in name_patterns),
+            re.IGNORECASE if os.name == "nt" else 0,
+        ) if name_patterns else None
+        self._snapshot: Dict[str, int] = {}
 
-    def _hash_dir(self):
-        """Return a mapping {filepath: mtime}."""
+    def _hash_dir(self) -> Dict[str, int]:
+        """Return a mapping {filepath: mtime_ns}."""
         mapping = {}
-        for root, _, files in os.walk(self.path):
-            for f in files:
-                fp = Path(root) / f
-                if not self.recursive and fp.parent != self.path:
-                    continue
-                if any(fp.match(pattern) for pattern in self.patterns):
-                    mapping[str(fp)] = fp.stat().st_mtime
+        # scandir entries carry the file type, so only matching files are stat'ed,
+        # and subdirectories are only entered when recursing
+        stack = [str(self.path)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive:
+                                stack.append(entry.path)
+                        elif entry.is_file() and self._matches(entry.path, entry.name):
+                            mapping[entry.path] = entry.stat().st_mtime_ns
+                    except OSError:
+                        # The entry vanished between listing and stat
+                        continue
         return mapping
 
+    def _matches(self, filepath: str, name: str) -> bool:
+        if self._name_re is not None and self._name_re.match(name):
+            return True
+        return any(Path(filepath).match(pattern) for pattern in self._path_patterns)
+
+    def _context(self, filepath: str, event: str) -> TriggerContext:
+        return TriggerContext(
+            trigger_name=self.name,
+            data={
+                "filename": Path(filepath).name,
+                "filepath": filepath,
+                "event": event
+            },
+        )
+
     async def watch(self, queue_put):
+        if awatch is not None and self.path.is_dir():
+            await self._watch_events(queue_put)
+        else:
+            await self._watch_polling(queue_put)
+
+    async def _watch_events(self, queue_put):
+        # No watch_filter: report every file, like the polling scan does
+        async for changes in awatch(self.path, watch_filter=None, recursive=self.recursive):
+            for change, filepath in changes:
+                event = _CHANGE_EVENTS.get(change)
+                if event not in self.events:
+                    continue
+                fp = Path(filepath)
+                if not self.recursive and fp.parent != self.path:
+                    continue
+                if event != "deleted" and not fp.is_file():
+                    continue
+                if self._matches(filepath, fp.name):
+                    await queue_put(self._context(filepath, event))
+
+    async def _watch_polling(self, queue_put):
+        self._snapshot = await asyncio.to_thread(self._hash_dir)
+        loop = asyncio.get_running_loop()
+        # Poll against a monotonic deadline so scan time does not add to the interval
+        deadline = loop.time()
         while True:
-            await asyncio.sleep(self.interval)
-            new_snapshot = self._hash_dir()
+            deadline += self.interval
+            now = loop.time()
+            if deadline < now:
+                # The previous scan overran the interval; start a fresh interval
+                # from now instead of rescanning back to back
+                deadline = now + self.interval
+            await asyncio.sleep(deadline - now)
+            # The scan is blocking I/O; keep it off the event loop
+            new_snapshot = await asyncio.to_thread(self._hash_dir)
             if new_snapshot != self._snapshot:
                 # Find changed files
                 changed_files = []
@@ -106,16 +188,7 @@ class FolderMonitorTrigger(Trigger):
                 # Create context for each changed file
                 for filepath, event in changed_files:
                     if event in self.events:
-                        filename = Path(filepath).name
-                        ctx = TriggerContext(
-                            trigger_name=self.name,
-                            data={
-                                "filename": filename,
-                                "filepath": filepath,
-                                "event": event
-                            },
-                        )
-                        await queue_put(ctx)
+                        await queue_put(self._context(filepath, event))
 
                 # Update snapshot
                 self._snapshot = new_snapshot 
\ No newline at end of file
@@ -1,4 +1,5 @@
 import asyncio
+import hmac
 from typing import Dict, Any
 
 from ..core import Trigger, TriggerContext
@@ -39,16 +40,46 @@ class WebHookMonitorTrigger(Trigger):
                 type="string",
                 description="Authentication key for the webhook",
                 required=False
+            ),
+            ConfigField(
+                name="max_queue",
+                type="integer",
+                description="Maximum number of webhook events buffered before new ones are rejected with 503",
+                default=1024,
+                required=False
+            ),
+            ConfigField(
+                name="batch_max_size",
+                type="integer",
+                description="Maximum webhook events folded into one trigger context (1 disables batching)",
+                default=1,
+                required=False
+            ),
+            ConfigField(
+                name="batch_timeout_ms",
+                type="integer",
+                description="How long to wait for more events to fill a batch, in milliseconds",
+                default=50,
+                required=False
             )
         ])
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.route: str = config.get("route", f"/hooks/{self.name}")
-        self.auth_key: str = config.get("auth_key", "")
-        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+        self.route: str = config.get("route") or f"/hooks/{self.name}"
+        # A null or non-string key in the config must not break verification
+        self.auth_key: str = str(config.get("auth_key") or "")
+        self._auth_key_bytes = self.auth_key.encode()
+        # Bounded so a burst against a slow consumer sheds load back to the
+        # webhook senders instead of growing memory without limit
+        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=int(config.get("max_queue", 1024)))
+        self.batch_max_size = int(config.get("batch_max_size", 1))
+        self.batch_timeout = int(config.get("batch_timeout_ms", 50)) / 1000
 
     async def watch(self, queue_put):
+        if self.batch_max_size > 1:
+            await self._watch_batched(queue_put)
+            return
         while True:
             payload = await self._queue.get()
             ctx = TriggerContext(
@@ -60,6 +91,49 @@ class WebHookMonitorTrigger(Trigger):
             )
             await queue_put(ctx)
 
+    async def _watch_batched(self, queue_put):
+        """Fold events arriving within the batch window into one context.
+
+        ``payload`` and ``headers`` in the context data are lists, one entry
+        per webhook event, in arrival order.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_timeout
+            while len(batch) < self.batch_max_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            ctx = TriggerContext(
+                trigger_name=self.name,
+                data={
+                    "payload": [payload.get("body", {}) for payload in batch],
+                    "headers": [payload.get("headers", {}) for payload in batch]
+                },
+            )
+            await queue_put(ctx)
+
+    def verify(self, provided: str) -> bool:
+        """Check the ``X-Auth-Key`` sent with a webhook in constant time.
+
+        Webhooks without a configured ``auth_key`` accept every request.
+        """
+        if not self._auth_key_bytes:
+            return True
+        return hmac.compare_digest(self._auth_key_bytes, provided.encode())
+
     async def enqueue(self, payload: Dict[str, Any]):
-        """Called by external server when webhook event arrives."""
-        await self._queue.put(payload) 
\ No newline at end of file
+        """Called by external server when webhook event arrives.
+
+        Raises ``asyncio.QueueFull`` when the buffer is full; the server answers
+        503 so the sender can retry later.
+        """
+        self._queue.put_nowait(payload) 
\ No newline at end of file